@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Service, Project, PortfolioImage, Testimonial, SiteSetting, ContactSubmission, Technology
+from .models import Service, Project, PortfolioImage, Testimonial, SiteSetting, ContactSubmission, Technology, ImageJob, NewsletterSubscriber
 
 class ImageAdminMixin:
     def image_preview(self, obj):
@@ -218,10 +218,11 @@ class TestimonialAdmin(admin.ModelAdmin):
 
 @admin.register(ContactSubmission)
 class ContactSubmissionAdmin(admin.ModelAdmin):
-    list_display = ['name', 'email', 'subject', 'submitted_at', 'read']
-    list_filter = ['read', 'submitted_at']
+    list_display = ['name', 'email', 'subject', 'submitted_at', 'read', 'delivery_status']
+    list_filter = ['read', 'delivery_status', 'submitted_at']
     search_fields = ['name', 'email', 'subject', 'message']
-    readonly_fields = ['name', 'email', 'subject', 'message', 'submitted_at']
+    readonly_fields = ['name', 'email', 'subject', 'message', 'submitted_at',
+                       'delivery_status', 'delivery_attempts', 'next_attempt_at', 'delivered_at', 'last_error']
     list_editable = ['read']
     
     def has_add_permission(self, request):
@@ -235,6 +236,25 @@ class TechnologyAdmin(admin.ModelAdmin):
     search_fields = ['name']
     ordering = ['category', 'order']
 
+@admin.register(ImageJob)
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = ['file_name', 'status', 'attempts', 'created_at', 'updated_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['file_name']
+    readonly_fields = ['file_name', 'attempts', 'error', 'created_at', 'updated_at']
+
+    def has_add_permission(self, request):
+        return False
+
+@admin.register(NewsletterSubscriber)
+class NewsletterSubscriberAdmin(admin.ModelAdmin):
+    list_display = ['email', 'is_active', 'subscribed_at', 'updated_at']
+    list_filter = ['is_active', 'subscribed_at']
+    search_fields = ['email']
+    readonly_fields = ['subscribed_at', 'updated_at']
+    # Large lists: skip the unfiltered COUNT(*); use export_subscribers for bulk access
+    show_full_result_count = False
+
 # Custom Admin Site Header
 admin.site.site_header = "Portfolio Admin Panel"
 admin.site.site_title = "Portfolio Admin"
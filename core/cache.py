@@ -0,0 +1,77 @@
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .metrics import record_cache
+from .versions import get_version, get_versions
+
+
+def _page_cache():
+    return caches[getattr(settings, 'PAGE_CACHE_ALIAS', 'default')]
+
+
+def _is_cacheable_request(request):
+    """Anonymous GET/HEAD requests without a session or pending messages"""
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    return not (settings.SESSION_COOKIE_NAME in request.COOKIES or 'messages' in request.COOKIES)
+
+
+def page_cache_key(request):
+    path = hashlib.md5(request.get_full_path().encode(), usedforsecurity=False).hexdigest()
+    return f'core:page:{get_version()}:{path}'
+
+
+def _cached_response(request):
+    """``(cache, key, response)`` for a cacheable request; ``response`` is ``None`` on a miss"""
+    if not getattr(settings, 'PAGE_CACHE_ENABLED', True) or not _is_cacheable_request(request):
+        return None, None, None
+    cache = _page_cache()
+    key = page_cache_key(request)
+    response = cache.get(key)
+    record_cache('page', response is not None)
+    if response is not None:
+        response['X-Page-Cache'] = 'hit'
+    return cache, key, response
+
+
+def _store_response(cache, key, response):
+    if response.status_code == 200 and not response.streaming and not response.cookies:
+        if hasattr(response, 'render') and callable(response.render):
+            response.render()
+        cache.set(key, response, getattr(settings, 'PAGE_CACHE_TIMEOUT', 600))
+    response['X-Page-Cache'] = 'miss'
+    return response
+
+
+def fragment_cache():
+    return caches[getattr(settings, 'FRAGMENT_CACHE_ALIAS', 'default')]
+
+
+def fragment_cache_key(name, models, vary_on=()):
+    """Key for template fragment ``name``, stale once any of ``models`` changes"""
+    versions = ':'.join(str(version) for version in get_versions(*models)) if models else ''
+    vary = hashlib.md5(
+        ':'.join(str(value) for value in vary_on).encode(), usedforsecurity=False,
+    ).hexdigest() if vary_on else ''
+    return f'core:fragment:{name}:{versions}:{vary}'
+
+
+def cache_public_page(view):
+    """Serve anonymous hits of ``view`` from the page cache.
+
+    Keys embed the global content version, so any admin edit makes every
+    cached page stale at once without touching the ORM on the read path.
+    The cache is read directly from the event loop since it never
+    touches the database; ``view`` must be a coroutine function.
+    """
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        cache, key, response = _cached_response(request)
+        if response is not None:
+            return response
+        response = await view(request, *args, **kwargs)
+        return response if cache is None else _store_response(cache, key, response)
+    return wrapper
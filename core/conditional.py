@@ -0,0 +1,92 @@
+"""Last-Modified / ETag functions for the public views' ``acondition``.
+
+They let the public views answer ``304 Not Modified`` from the content
+version or one indexed aggregate instead of rendering the page.
+"""
+import datetime
+from functools import wraps
+from inspect import isawaitable
+
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .models import Service, Project
+from .site_settings import aget_site_settings
+from .versions import get_version
+
+
+def _latest(*timestamps):
+    timestamps = [ts for ts in timestamps if ts is not None]
+    return max(timestamps) if timestamps else None
+
+
+def listing_etag(request, *args, **kwargs):
+    """Weak ETag from the content version, which also changes on deletes"""
+    return f'W/"{get_version()}"'
+
+
+def listing_last_modified(request, *args, **kwargs):
+    """When the content version was last bumped.
+
+    Every save or delete of listed content (Technology rows and
+    Testimonial edits included, which carry no usable timestamp) bumps
+    the version, so this costs no query and never trails the data.
+    """
+    return datetime.datetime.fromtimestamp(get_version() / 1e9, tz=datetime.timezone.utc)
+
+
+async def aservice_last_modified(request, service_id):
+    latest = await Service.objects.filter(pk=service_id, is_active=True).aaggregate(
+        service=Max('updated_at'),
+        projects=Max('projects__updated_at'),
+    )
+    if latest['service'] is None:
+        return None
+    return _latest(latest['service'], latest['projects'], (await aget_site_settings()).updated_at)
+
+
+async def aproject_last_modified(request, project_id):
+    latest = await Project.objects.filter(pk=project_id).aaggregate(
+        project=Max('updated_at'),
+        related=Max('services__projects__updated_at'),
+    )
+    if latest['project'] is None:
+        return None
+    return _latest(latest['project'], latest['related'], (await aget_site_settings()).updated_at)
+
+
+def acondition(etag_func=None, last_modified_func=None):
+    """``django.views.decorators.http.condition`` for async views.
+
+    Django's version calls the ETag and Last-Modified functions
+    synchronously, which cannot query the database from the event loop.
+    Here either function may be a coroutine function.
+    """
+    async def call(func, request, *args, **kwargs):
+        value = func(request, *args, **kwargs)
+        return await value if isawaitable(value) else value
+
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            last_modified = None
+            if last_modified_func and (dt := await call(last_modified_func, request, *args, **kwargs)):
+                if not timezone.is_aware(dt):
+                    dt = timezone.make_aware(dt, datetime.timezone.utc)
+                last_modified = int(dt.timestamp())
+            etag = await call(etag_func, request, *args, **kwargs) if etag_func else None
+            etag = quote_etag(etag) if etag is not None else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            if request.method in ('GET', 'HEAD'):
+                if last_modified and not response.has_header('Last-Modified'):
+                    response.headers['Last-Modified'] = http_date(last_modified)
+                if etag:
+                    response.headers.setdefault('ETag', etag)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,142 @@
+"""Environment-driven database configuration and primary/replica routing.
+
+``parse_database_url`` turns ``DATABASE_URL``-style strings into Django
+``DATABASES`` entries. When a replica is configured,
+``PrimaryReplicaRouter`` sends reads to it and everything else to the
+primary. A request is pinned to the primary once it writes, for unsafe
+methods and for the admin (see ``core.middleware.DatabaseRoutingMiddleware``),
+so nobody reads their own writes from a lagging replica.
+
+``sqlite_options`` builds the opt-in SQLite tuning profile for
+single-node deployments.
+"""
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from urllib.parse import parse_qsl, unquote, urlparse
+
+from django.conf import settings
+
+ENGINES = {
+    'postgres': 'django.db.backends.postgresql',
+    'postgresql': 'django.db.backends.postgresql',
+    'pgsql': 'django.db.backends.postgresql',
+    'sqlite': 'django.db.backends.sqlite3',
+}
+
+# Always read from the primary: framework state and write-heavy models
+PRIMARY_APPS = {'admin', 'auth', 'contenttypes', 'sessions'}
+PRIMARY_MODELS = {'core.contactsubmission', 'core.newslettersubscriber', 'core.imagejob'}
+
+# Tuned for many readers and one writer on a single box: WAL lets reads
+# proceed during writes, NORMAL sync is durable across app crashes in WAL
+# mode, and the busy timeout queues writers instead of failing them
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64000,  # negative means KiB, so 64 MB
+    'busy_timeout': 5000,  # ms
+    'temp_store': 'MEMORY',
+}
+
+PRAGMA_NAME_RE = re.compile(r'^[a-z_]+$')
+
+_pinned = ContextVar('core_database_pinned', default=False)
+
+
+def parse_database_url(url, conn_max_age=0, pool_size=0):
+    """Build a ``DATABASES`` entry from ``postgres://`` or ``sqlite:///`` URLs.
+
+    Query parameters become ``OPTIONS`` (e.g. ``?sslmode=require``). A
+    positive ``pool_size`` enables psycopg's connection pool, which Django
+    requires to be used instead of persistent connections.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in ENGINES:
+        raise ValueError(f"Unsupported database URL scheme: {parsed.scheme!r}")
+
+    engine = ENGINES[parsed.scheme]
+    if engine == 'django.db.backends.sqlite3':
+        return {'ENGINE': engine, 'NAME': unquote(parsed.path[1:]) or ':memory:'}
+
+    options = dict(parse_qsl(parsed.query))
+    config = {
+        'ENGINE': engine,
+        'NAME': unquote(parsed.path[1:]),
+        'USER': unquote(parsed.username or ''),
+        'PASSWORD': unquote(parsed.password or ''),
+        'HOST': parsed.hostname or '',
+        'PORT': str(parsed.port or ''),
+        'CONN_MAX_AGE': conn_max_age,
+        'CONN_HEALTH_CHECKS': conn_max_age != 0,
+        'OPTIONS': options,
+    }
+    if pool_size:
+        config['CONN_MAX_AGE'] = 0
+        config['CONN_HEALTH_CHECKS'] = False
+        options['pool'] = {'min_size': 1, 'max_size': pool_size}
+    return config
+
+
+def sqlite_options(pragmas=None):
+    """SQLite ``OPTIONS`` that apply ``pragmas`` to every new connection.
+
+    Transactions start as ``BEGIN IMMEDIATE`` so a writer takes the lock up
+    front and waits out ``busy_timeout``, rather than failing with
+    "database is locked" when upgrading a read transaction.
+    """
+    pragmas = SQLITE_PRAGMAS if pragmas is None else pragmas
+    for name in pragmas:
+        if not PRAGMA_NAME_RE.match(name):
+            raise ValueError(f"Invalid SQLite pragma name: {name!r}")
+    return {
+        'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in pragmas.items()),
+        'transaction_mode': 'IMMEDIATE',
+    }
+
+
+def replica_alias():
+    return getattr(settings, 'DATABASE_REPLICA_ALIAS', None)
+
+
+def pin_to_primary(pinned=True):
+    """Route the rest of this request/task's reads to the primary; returns a reset token"""
+    return _pinned.set(pinned)
+
+
+def unpin(token):
+    _pinned.reset(token)
+
+
+@contextmanager
+def use_primary():
+    token = pin_to_primary()
+    try:
+        yield
+    finally:
+        unpin(token)
+
+
+class PrimaryReplicaRouter:
+    """Reads go to the replica; writes, migrations and pinned requests to ``default``"""
+
+    def db_for_read(self, model, **hints):
+        alias = replica_alias()
+        if (alias is None or _pinned.get()
+                or model._meta.app_label in PRIMARY_APPS
+                or model._meta.label_lower in PRIMARY_MODELS):
+            return 'default'
+        return alias
+
+    def db_for_write(self, model, **hints):
+        # Read-your-writes for whatever else this request does
+        _pinned.set(True)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
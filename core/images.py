@@ -0,0 +1,204 @@
+import hashlib
+import io
+import json
+import logging
+import posixpath
+import threading
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import ImageField
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from .models import Service, Project, PortfolioImage, Testimonial, SiteSetting
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_DIR = 'derivatives'
+MANIFEST_NAME = 'manifest.json'
+
+# format -> (MIME type, Pillow format, Pillow feature, file extension, save options)
+FORMATS = {
+    'avif': ('image/avif', 'AVIF', 'avif', 'avif', {'quality': 50}),
+    'webp': ('image/webp', 'WEBP', 'webp', 'webp', {'quality': 80, 'method': 6}),
+    'jpeg': ('image/jpeg', 'JPEG', 'jpg', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+# Models whose ImageFields get derivatives
+IMAGE_MODELS = [Service, Project, PortfolioImage, Testimonial, SiteSetting]
+
+_manifest_lock = threading.Lock()
+_manifests = {}
+
+
+def image_widths():
+    return tuple(getattr(settings, 'IMAGE_DERIVATIVE_WIDTHS', (320, 640, 960, 1280)))
+
+
+def image_formats():
+    """Configured derivative formats that this Pillow build can encode"""
+    configured = getattr(settings, 'IMAGE_DERIVATIVE_FORMATS', ('avif', 'webp', 'jpeg'))
+    return [fmt for fmt in configured if features.check(FORMATS[fmt][2])]
+
+
+def derivative_dir(name):
+    """Storage directory holding the derivatives of the file ``name``"""
+    directory, filename = posixpath.split(name)
+    return posixpath.join(directory, DERIVATIVE_DIR, filename)
+
+
+def derivative_name(name, width, fmt):
+    """Requested storage name of a variant; see the manifest for the stored one"""
+    return posixpath.join(derivative_dir(name), f'{width}w.{FORMATS[fmt][3]}')
+
+
+def manifest_name(name):
+    return posixpath.join(derivative_dir(name), MANIFEST_NAME)
+
+
+def image_fields(instance):
+    """Populated ImageField files on a model instance"""
+    for field in instance._meta.fields:
+        if isinstance(field, ImageField):
+            fieldfile = getattr(instance, field.name)
+            if fieldfile:
+                yield fieldfile
+
+
+def _replace(storage, name, content):
+    if storage.exists(name):
+        storage.delete(name)
+    return storage.save(name, ContentFile(content))
+
+
+def _encode(image, fmt):
+    _, pillow_format, _, _, options = FORMATS[fmt]
+    if fmt == 'jpeg' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    elif image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+    buffer = io.BytesIO()
+    image.save(buffer, pillow_format, **options)
+    return buffer.getvalue()
+
+
+def generate_derivatives(name, storage=default_storage):
+    """Write resized variants of the image ``name`` in every derivative format.
+
+    Widths wider than the original are skipped (an image smaller than every
+    configured width is re-encoded at its own width). The manifest is
+    written last, so its presence means the whole set is ready; it also
+    records the stored name (which a content-hashed storage may change),
+    byte size of every variant and the source's SHA-256.
+    """
+    with storage.open(name, 'rb') as source_file:
+        data = source_file.read()
+    with Image.open(io.BytesIO(data)) as source:
+        source = ImageOps.exif_transpose(source)
+        source.load()
+
+    width, height = source.size
+    widths = [w for w in image_widths() if w < width] or [width]
+    formats = image_formats()
+    variants = {fmt: [] for fmt in formats}
+    files = {fmt: [] for fmt in formats}
+    sizes = {fmt: [] for fmt in formats}
+    for w in widths:
+        resized = source if w == width else source.resize((w, max(1, round(height * w / width))), Image.LANCZOS)
+        for fmt in formats:
+            encoded = _encode(resized, fmt)
+            variants[fmt].append(w)
+            files[fmt].append(_replace(storage, derivative_name(name, w, fmt), encoded))
+            sizes[fmt].append(len(encoded))
+
+    manifest = {
+        'source': name,
+        'sha256': hashlib.sha256(data).hexdigest(),
+        'source_bytes': len(data),
+        'width': width,
+        'height': height,
+        'variants': variants,
+        'files': files,
+        'bytes': sizes,
+    }
+    previous = read_manifest(name, storage)
+    _replace(storage, manifest_name(name), json.dumps(manifest).encode())
+    if previous is not None:
+        # Content-hashed storages save new variants under new names
+        current = {f for names in files.values() for f in names}
+        for names in previous.get('files', {}).values():
+            for stale in set(names) - current:
+                storage.delete(stale)
+    modified = _manifest_modified_time(name, storage)
+    if modified is not None:
+        with _manifest_lock:
+            _manifests[name] = (modified, manifest)
+    return manifest
+
+
+def variant_names(manifest, name, fmt):
+    """Stored names of the ``fmt`` variants listed in ``manifest``"""
+    files = manifest.get('files')
+    if files is not None:
+        return files[fmt]
+    return [derivative_name(name, w, fmt) for w in manifest['variants'][fmt]]
+
+
+def read_manifest(name, storage=default_storage):
+    """Read the manifest for ``name`` from storage, bypassing the process cache"""
+    try:
+        with storage.open(manifest_name(name), 'rb') as f:
+            return json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _manifest_modified_time(name, storage):
+    try:
+        return storage.get_modified_time(manifest_name(name))
+    except (OSError, NotImplementedError):
+        return None
+
+
+def get_manifest(fieldfile):
+    """Return the derivative manifest for ``fieldfile``, or ``None`` if not ready.
+
+    Parsed manifests are kept in process memory alongside the manifest
+    file's modification time. ``generate_derivatives`` may rewrite a
+    manifest from another process (``optimize_media --force``, new widths),
+    so the cached copy is only used while that time is unchanged; storages
+    that cannot report it are read every time.
+    """
+    modified = _manifest_modified_time(fieldfile.name, fieldfile.storage)
+    cached = _manifests.get(fieldfile.name)
+    if cached is not None and modified is not None and cached[0] == modified:
+        return cached[1]
+    manifest = read_manifest(fieldfile.name, fieldfile.storage)
+    with _manifest_lock:
+        if manifest is None or modified is None:
+            _manifests.pop(fieldfile.name, None)
+        else:
+            _manifests[fieldfile.name] = (modified, manifest)
+    return manifest
+
+
+def clear_manifest_cache():
+    with _manifest_lock:
+        _manifests.clear()
+
+
+def missing_derivatives(instance):
+    """Populated image files on ``instance`` whose derivatives are not ready"""
+    for fieldfile in image_fields(instance):
+        if get_manifest(fieldfile) is None and fieldfile.storage.exists(fieldfile.name):
+            yield fieldfile
+
+
+def generate_missing_derivatives(instance):
+    """Generate derivatives for every image on ``instance`` that lacks them"""
+    for fieldfile in missing_derivatives(instance):
+        try:
+            generate_derivatives(fieldfile.name, fieldfile.storage)
+        except (OSError, UnidentifiedImageError) as e:
+            logger.warning("Could not generate derivatives for %s: %s", fieldfile.name, e)
@@ -0,0 +1,223 @@
+"""Per-request database and template instrumentation.
+
+``RequestTimer`` collects the numbers for one request. While a timer is
+active (see ``core.middleware.RequestTimingMiddleware``), database
+execute wrappers and the template backend report into it through a
+context variable, so concurrent requests never mix their figures.
+
+``QueryInspector`` logs slow queries and SQL repeated within one request
+(see ``core.middleware.QueryInspectionMiddleware``); ``query_report``
+aggregates both across requests for a periodic summary.
+"""
+import logging
+import os
+import threading
+import time
+import traceback
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import Template
+
+logger = logging.getLogger('core.queries')
+
+_current = ContextVar('core_request_timer', default=None)
+_template_render = Template.render
+
+
+class RequestTimer:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.view_time = 0.0
+        self._template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+    def start(self):
+        """Activate the timer and wrap every database connection of this thread"""
+        self._token = _current.set(self)
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        self._started = time.perf_counter()
+
+    def stop(self):
+        self.view_time = time.perf_counter() - self._started
+        self._stack.close()
+        _current.reset(self._token)
+
+    def as_dict(self):
+        return {
+            'queries': self.queries,
+            'db_ms': round(self.db_time * 1000, 2),
+            'template_ms': round(self.template_time * 1000, 2),
+            'view_ms': round(self.view_time * 1000, 2),
+        }
+
+    def server_timing(self):
+        return (
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries", '
+            f'tpl;dur={self.template_time * 1000:.2f}, '
+            f'view;dur={self.view_time * 1000:.2f}'
+        )
+
+
+def current_timer():
+    return _current.get()
+
+
+@wraps(_template_render)
+def _timed_render(self, context=None, request=None):
+    timer = _current.get()
+    if timer is None:
+        return _template_render(self, context, request)
+    # render_to_string() inside a template must not be counted twice
+    timer._template_depth += 1
+    started = time.perf_counter()
+    try:
+        return _template_render(self, context, request)
+    finally:
+        timer._template_depth -= 1
+        if not timer._template_depth:
+            timer.template_time += time.perf_counter() - started
+
+
+def instrument_templates():
+    """Route Django template rendering through the active timer (idempotent)"""
+    Template.render = _timed_render
+
+
+def query_origin():
+    """``path:line in function`` of the innermost project frame that ran the query"""
+    root = str(settings.BASE_DIR) + os.sep
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+        if (filename.startswith(root) and filename != __file__
+                and 'site-packages' not in filename and f'{os.sep}.venv{os.sep}' not in filename):
+            return f'{os.path.relpath(filename, root)}:{frame.lineno} in {frame.name}'
+    return None
+
+
+class QueryReport:
+    """Slow and duplicated queries aggregated across requests, by view and SQL"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.entries = {}
+            self.started = time.monotonic()
+
+    def record(self, kind, view, sql, duration, origin, occurrences=1):
+        with self._lock:
+            entry = self.entries.setdefault((kind, view, sql), {
+                'kind': kind, 'view': view, 'sql': sql, 'origin': origin,
+                'requests': 0, 'occurrences': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+            })
+            entry['requests'] += 1
+            entry['occurrences'] += occurrences
+            entry['total_ms'] += duration * 1000
+            entry['max_ms'] = max(entry['max_ms'], duration * 1000)
+
+    def top(self, limit=10):
+        with self._lock:
+            entries = [dict(entry) for entry in self.entries.values()]
+        return sorted(entries, key=lambda entry: entry['total_ms'], reverse=True)[:limit]
+
+    def log_if_due(self, interval, limit=10):
+        """Log and reset the aggregate once every ``interval`` seconds"""
+        if time.monotonic() - self.started < interval:
+            return False
+        entries = self.top(limit)
+        elapsed = time.monotonic() - self.started
+        self.reset()
+        if entries:
+            logger.info("Query report for the last %.0fs (%s pattern(s)):", elapsed, len(entries))
+            for entry in entries:
+                logger.info(
+                    "  %(kind)s view=%(view)s requests=%(requests)s occurrences=%(occurrences)s "
+                    "total_ms=%(total_ms).1f max_ms=%(max_ms).1f origin=%(origin)s sql=%(sql)s",
+                    entry,
+                )
+        return True
+
+
+query_report = QueryReport()
+
+
+class QueryInspector:
+    """Execute wrapper that flags slow queries and SQL repeated in one request"""
+
+    def __init__(self, view=None, slow_threshold=0.1, duplicate_threshold=2):
+        self.view = view
+        self.slow_threshold = slow_threshold
+        self.duplicate_threshold = duplicate_threshold
+        self.seen = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            if duration >= self.slow_threshold:
+                origin = query_origin()
+                logger.warning(
+                    "Slow query (%.1f ms) in view=%s at %s: %s", duration * 1000, self.view, origin, sql,
+                )
+                query_report.record('slow', self.view, sql, duration, origin)
+            if not many:
+                self._count(sql, params, duration)
+
+    def _count(self, sql, params, duration):
+        # Keyed on the parameterized SQL, so N+1 loops and filters that
+        # differ only in their values count as repeats of one query
+        seen = self.seen.get(sql)
+        if seen is None:
+            self.seen[sql] = [1, duration, None, {repr(params)}]
+            return
+        seen[0] += 1
+        seen[1] += duration
+        seen[3].add(repr(params))
+        if seen[0] == self.duplicate_threshold:
+            seen[2] = query_origin()
+
+    def duplicates(self):
+        """``(sql, count, total seconds, origin, exact repeats)`` for SQL run ``duplicate_threshold``+ times.
+
+        ``exact repeats`` counts the executions whose params had already been
+        seen, i.e. results the request could have reused.
+        """
+        return [
+            (sql, count, duration, origin, count - len(distinct))
+            for sql, (count, duration, origin, distinct) in self.seen.items()
+            if count >= self.duplicate_threshold
+        ]
+
+    def finish(self):
+        for sql, count, duration, origin, exact in self.duplicates():
+            logger.warning(
+                "Duplicate query x%s (%s exact) in view=%s at %s: %s", count, exact, self.view, origin, sql,
+            )
+            query_report.record('duplicate', self.view, sql, duration, origin, occurrences=count)
+
+    @contextmanager
+    def activate(self):
+        """Wrap every database connection of this thread while the block runs"""
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            yield self
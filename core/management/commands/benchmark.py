@@ -0,0 +1,350 @@
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.db.backends.signals import connection_created
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import NoReverseMatch, reverse
+
+from core.models import Project, Service
+
+# url name=weight; routes that write data must be asked for explicitly
+DEFAULT_MIX = 'home=4,projects=3,projects_page=2,services=2,about=1,contact=1'
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a sorted list"""
+    if not values:
+        return None
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+
+def latency_summary(latencies):
+    latencies = sorted(latencies)
+    summary = {f'p{pct}': percentile(latencies, pct) for pct in (50, 90, 95, 99)}
+    summary['max'] = latencies[-1] if latencies else None
+    summary['mean'] = sum(latencies) / len(latencies) if latencies else None
+    return {key: round(value, 2) if value is not None else None for key, value in summary.items()}
+
+
+def process_memory_kb(pid):
+    """Current and peak RSS of ``pid`` from /proc (Linux only)"""
+    memory = {}
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in ('VmRSS', 'VmHWM'):
+                    memory['rss_kb' if key == 'VmRSS' else 'peak_rss_kb'] = int(value.split()[0])
+    except OSError:
+        return None
+    return memory
+
+
+def own_memory_kb():
+    """Peak RSS of this process via ``getrusage``; ``None`` where unavailable (Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    return {'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class QueryCounter:
+    """Count queries on every database connection, including ones opened by worker threads"""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+        self._wrapped = []
+
+    def __call__(self, execute, sql, params, many, context):
+        with self._lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+    def _wrap(self, connection):
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+            self._wrapped.append(connection)
+
+    def _on_connect(self, sender, connection, **kwargs):
+        self._wrap(connection)
+
+    def __enter__(self):
+        for connection in connections.all(initialized_only=True):
+            self._wrap(connection)
+        connection_created.connect(self._on_connect, weak=False)
+        return self
+
+    def __exit__(self, *exc_info):
+        connection_created.disconnect(self._on_connect)
+        for connection in self._wrapped:
+            if self in connection.execute_wrappers:
+                connection.execute_wrappers.remove(self)
+
+
+class Command(BaseCommand):
+    help = 'Drive concurrent requests at the site and report throughput and latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--mode', choices=['wsgi', 'asgi', 'http'], default='wsgi',
+            help='Run the WSGI or ASGI app in-process, or send HTTP to --url (default: wsgi)',
+        )
+        parser.add_argument(
+            '--url', default='http://127.0.0.1:8000',
+            help='Base URL of a running server for --mode http',
+        )
+        parser.add_argument(
+            '--requests', type=int, default=500,
+            help='Total measured requests (default: 500)',
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=4,
+            help='Concurrent clients (default: 4)',
+        )
+        parser.add_argument(
+            '--warmup', type=int, default=20,
+            help='Unmeasured requests sent first to fill caches (default: 20)',
+        )
+        parser.add_argument(
+            '--mix', default=DEFAULT_MIX,
+            help=f'Comma-separated url_name=weight pairs (default: {DEFAULT_MIX})',
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Random seed for the request order',
+        )
+        parser.add_argument(
+            '--no-page-cache', action='store_true',
+            help='Disable the full-page cache for in-process runs',
+        )
+        parser.add_argument(
+            '--pid', type=int, action='append', default=[],
+            help='Server worker PID to report memory for in --mode http (repeatable)',
+        )
+        parser.add_argument(
+            '--output', '-o', default='benchmark.json',
+            help='JSON results file (default: benchmark.json)',
+        )
+
+    def route_paths(self):
+        """Paths for every route in core/urls.py, with real object IDs"""
+        service = Service.objects.filter(is_active=True).values_list('pk', flat=True).first()
+        project = Project.objects.values_list('pk', flat=True).first()
+        paths = {}
+        for name in ['home', 'services', 'projects', 'projects_page', 'contact', 'about', 'subscribe_newsletter']:
+            paths[name] = ('post' if name == 'subscribe_newsletter' else 'get', reverse(name))
+        if service is not None:
+            paths['service_detail'] = ('get', reverse('service_detail', args=[service]))
+        if project is not None:
+            paths['project_detail'] = ('get', reverse('project_detail', args=[project]))
+        return paths
+
+    def parse_mix(self, mix, paths):
+        weights = {}
+        for item in mix.split(','):
+            name, _, weight = item.strip().partition('=')
+            if name not in paths:
+                raise CommandError(f'Unknown or unavailable route "{name}"; choose from {", ".join(sorted(paths))}')
+            try:
+                weights[name] = float(weight or 1)
+            except ValueError:
+                raise CommandError(f'Invalid weight in "{item}"')
+        return weights
+
+    def plan(self, weights, count, seed):
+        rng = random.Random(seed)
+        return rng.choices(list(weights), weights=list(weights.values()), k=count)
+
+    # Runners return [(route, status, latency_ms)]
+
+    def run_wsgi(self, plan, paths, concurrency):
+        def worker(names):
+            client = Client(raise_request_exception=False)
+            results = []
+            for name in names:
+                method, path = paths[name]
+                data = {'email': 'benchmark@example.com'} if method == 'post' else None
+                started = time.perf_counter()
+                response = getattr(client, method)(path, data)
+                results.append((name, response.status_code, (time.perf_counter() - started) * 1000))
+            return results
+
+        return self._run_threads(worker, plan, concurrency)
+
+    def run_http(self, plan, paths, concurrency, base_url):
+        def worker(names):
+            results = []
+            for name in names:
+                method, path = paths[name]
+                data = b'email=benchmark%40example.com' if method == 'post' else None
+                request = urllib.request.Request(base_url.rstrip('/') + path, data=data)
+                started = time.perf_counter()
+                try:
+                    with urllib.request.urlopen(request, timeout=30) as response:
+                        response.read()
+                        status = response.status
+                except urllib.error.HTTPError as e:
+                    status = e.code
+                except OSError:
+                    status = 0
+                results.append((name, status, (time.perf_counter() - started) * 1000))
+            return results
+
+        return self._run_threads(worker, plan, concurrency)
+
+    def _run_threads(self, worker, plan, concurrency):
+        if concurrency == 1:
+            return worker(plan)
+        chunks = [plan[i::concurrency] for i in range(concurrency)]
+        results = [[] for _ in chunks]
+
+        def run(index):
+            try:
+                results[index] = worker(chunks[index])
+            finally:
+                close_old_connections()
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(len(chunks))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return [result for chunk in results for result in chunk]
+
+    def run_asgi(self, plan, paths, concurrency):
+        async def worker(names):
+            client = AsyncClient(raise_request_exception=False)
+            results = []
+            for name in names:
+                method, path = paths[name]
+                data = {'email': 'benchmark@example.com'} if method == 'post' else None
+                started = time.perf_counter()
+                response = await getattr(client, method)(path, data)
+                results.append((name, response.status_code, (time.perf_counter() - started) * 1000))
+            return results
+
+        async def main():
+            chunks = [plan[i::concurrency] for i in range(concurrency)]
+            return await asyncio.gather(*(worker(chunk) for chunk in chunks))
+
+        return [result for chunk in asyncio.run(main()) for result in chunk]
+
+    def run(self, mode, plan, paths, options):
+        concurrency = max(1, options['concurrency'])
+        if mode == 'http':
+            return self.run_http(plan, paths, concurrency, options['url'])
+        if mode == 'asgi':
+            return self.run_asgi(plan, paths, concurrency)
+        return self.run_wsgi(plan, paths, concurrency)
+
+    def handle(self, *args, **options):
+        mode = options['mode']
+        try:
+            paths = self.route_paths()
+        except NoReverseMatch as e:
+            raise CommandError(str(e))
+        weights = self.parse_mix(options['mix'], paths)
+        plan = self.plan(weights, options['requests'], options['seed'])
+
+        overrides = {'RATE_LIMIT_ENABLED': False}
+        if options['no_page_cache']:
+            overrides['PAGE_CACHE_ENABLED'] = False
+        # The counter is installed before the warm-up so it also wraps
+        # connections that the warm-up opens and the measured run reuses
+        with override_settings(**overrides), QueryCounter() as queries:
+            if options['warmup']:
+                self.run(mode, self.plan(weights, options['warmup'], options['seed'] + 1), paths, options)
+                queries.count = 0
+
+            self.stdout.write(
+                f'Benchmarking {len(plan)} request(s) over {options["concurrency"]} client(s) in {mode} mode...'
+            )
+            started = time.perf_counter()
+            results = self.run(mode, plan, paths, options)
+            elapsed = time.perf_counter() - started
+
+        report = self.report(mode, options, weights, results, elapsed, None if mode == 'http' else queries.count)
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2)
+        self.print_report(report)
+        self.stdout.write(self.style.SUCCESS(f'✓ Results saved to {options["output"]}'))
+
+    def report(self, mode, options, weights, results, elapsed, query_count):
+        by_route = defaultdict(list)
+        for name, status, latency in results:
+            by_route[name].append((status, latency))
+
+        if mode == 'http':
+            memory = {str(pid): process_memory_kb(pid) for pid in options['pid']}
+        else:
+            # One in-process worker: this process
+            memory = {str(os.getpid()): process_memory_kb(os.getpid()) or own_memory_kb()}
+
+        return {
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'mode': mode,
+            'target': options['url'] if mode == 'http' else 'in-process',
+            'requests': len(results),
+            'concurrency': options['concurrency'],
+            'mix': weights,
+            'seed': options['seed'],
+            'page_cache': not options['no_page_cache'],
+            'duration_s': round(elapsed, 3),
+            'requests_per_second': round(len(results) / elapsed, 2) if elapsed else None,
+            'errors': sum(1 for _, status, _ in results if status == 0 or status >= 400),
+            'latency_ms': latency_summary([latency for _, _, latency in results]),
+            'queries_per_request': round(query_count / len(results), 2) if query_count is not None and results else None,
+            'memory': memory,
+            'routes': {
+                name: {
+                    'requests': len(samples),
+                    'errors': sum(1 for status, _ in samples if status == 0 or status >= 400),
+                    'latency_ms': latency_summary([latency for _, latency in samples]),
+                }
+                for name, samples in sorted(by_route.items())
+            },
+        }
+
+    def print_report(self, report):
+        self.stdout.write(f'{"route":<16} {"reqs":>6} {"errors":>6} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8}')
+        for name, route in report['routes'].items():
+            latency = route['latency_ms']
+            self.stdout.write(
+                f'{name:<16} {route["requests"]:>6} {route["errors"]:>6} '
+                f'{latency["p50"]:>8.1f} {latency["p95"]:>8.1f} {latency["p99"]:>8.1f}'
+            )
+        latency = report['latency_ms']
+        self.stdout.write(
+            f'{report["requests_per_second"]} req/s, p50 {latency["p50"]} ms, p95 {latency["p95"]} ms, '
+            f'p99 {latency["p99"]} ms, {report["errors"]} error(s)'
+        )
+        if report['queries_per_request'] is not None:
+            self.stdout.write(f'{report["queries_per_request"]} queries/request')
+        for pid, memory in report['memory'].items():
+            if memory:
+                self.stdout.write(f'Worker {pid}: ' + ', '.join(f'{k} {v}' for k, v in memory.items()))
@@ -0,0 +1,42 @@
+import csv
+
+from django.core.management.base import BaseCommand
+
+from core.models import NewsletterSubscriber
+
+CHUNK_SIZE = 2000
+
+
+class Command(BaseCommand):
+    help = 'Stream newsletter subscribers as CSV in constant memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', '-o',
+            help='File to write (default: stdout)',
+        )
+        parser.add_argument(
+            '--include-inactive', action='store_true',
+            help='Also export unsubscribed addresses',
+        )
+
+    def handle(self, *args, **options):
+        subscribers = NewsletterSubscriber.objects.order_by('pk')
+        if not options['include_inactive']:
+            subscribers = subscribers.filter(is_active=True)
+        rows = subscribers.values_list('email', 'is_active', 'subscribed_at').iterator(chunk_size=CHUNK_SIZE)
+
+        output = open(options['output'], 'w', newline='') if options['output'] else self.stdout
+        try:
+            writer = csv.writer(output)
+            writer.writerow(['email', 'is_active', 'subscribed_at'])
+            count = 0
+            for email, is_active, subscribed_at in rows:
+                writer.writerow([email, is_active, subscribed_at.isoformat()])
+                count += 1
+        finally:
+            if output is not self.stdout:
+                output.close()
+
+        if options['output']:
+            self.stdout.write(self.style.SUCCESS(f'✓ Exported {count} subscriber(s) to {options["output"]}'))
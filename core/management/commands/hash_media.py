@@ -0,0 +1,62 @@
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db.models import ImageField
+
+from core.images import IMAGE_MODELS, derivative_dir
+from core.media import is_hashed_name
+from core.models import ImageJob, SiteSetting
+from core.site_settings import invalidate_site_settings
+from core.versions import bump_version
+
+
+class Command(BaseCommand):
+    help = 'Re-store existing uploads under content-hashed names'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--delete-originals', action='store_true',
+            help='Delete the old files and their derivatives once every row points at the new name',
+        )
+
+    def handle(self, *args, **options):
+        renamed = {}
+        changed = set()
+        for model in IMAGE_MODELS:
+            for field in model._meta.fields:
+                if not isinstance(field, ImageField):
+                    continue
+                rows = model.objects.exclude(**{field.name: ''}).exclude(**{f'{field.name}__isnull': True})
+                for pk, name in rows.values_list('pk', field.name).iterator():
+                    if is_hashed_name(name):
+                        continue
+                    if name not in renamed:
+                        if not default_storage.exists(name):
+                            self.stdout.write(self.style.WARNING(f'! Missing file: {name}'))
+                            continue
+                        with default_storage.open(name, 'rb') as f:
+                            renamed[name] = default_storage.save(name, File(f))
+                        ImageJob.objects.create(file_name=renamed[name])
+                        self.stdout.write(f'{name} -> {renamed[name]}')
+                    # update() skips post_save, the job above covers derivatives
+                    model.objects.filter(pk=pk).update(**{field.name: renamed[name]})
+                    changed.add(model)
+
+        # update() sent no signals either, so drop cached pages and settings
+        # that still point at the old names before those are deleted
+        if changed:
+            bump_version(*(model._meta.model_name for model in changed))
+        if SiteSetting in changed:
+            invalidate_site_settings()
+
+        if options['delete_originals']:
+            for name in renamed:
+                default_storage.delete(name)
+                directory = derivative_dir(name)
+                if default_storage.exists(directory):
+                    _, files = default_storage.listdir(directory)
+                    for filename in files:
+                        default_storage.delete(f'{directory}/{filename}')
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Renamed {len(renamed)} file(s); run `manage.py image_worker --once` to build their derivatives'
+        ))
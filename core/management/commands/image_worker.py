@@ -0,0 +1,51 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.tasks import init_pool_process, process_pending_jobs, reset_stale_jobs
+
+
+class Command(BaseCommand):
+    help = 'Process queued image derivative jobs in a process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=os.cpu_count() or 1,
+            help='Number of pool processes (default: CPU count)',
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=2.0,
+            help='Seconds to sleep when the queue is empty',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Drain the queue and exit instead of polling forever',
+        )
+
+    def handle(self, *args, **options):
+        processes = max(1, options['processes'])
+        reset = reset_stale_jobs()
+        if reset:
+            self.stdout.write(self.style.WARNING(f'Re-queued {reset} interrupted job(s)'))
+
+        # Don't let forked pool processes inherit an open database connection
+        connections.close_all()
+        self.stdout.write(f'Image worker started with {processes} process(es)')
+        processed = 0
+        with ProcessPoolExecutor(max_workers=processes, initializer=init_pool_process) as executor:
+            try:
+                while True:
+                    count = process_pending_jobs(executor, batch_size=processes * 2)
+                    processed += count
+                    if count:
+                        self.stdout.write(f'Processed {count} job(s)')
+                    elif options['once']:
+                        break
+                    else:
+                        time.sleep(options['poll_interval'])
+            except KeyboardInterrupt:
+                self.stdout.write('Stopping image worker')
+        self.stdout.write(self.style.SUCCESS(f'✓ Processed {processed} job(s)'))
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import ImageField
+from PIL import UnidentifiedImageError
+
+from core.images import IMAGE_MODELS, generate_derivatives, read_manifest
+from core.tasks import init_pool_process
+
+CHECKPOINT_EVERY = 20
+
+
+def optimize_file(name, force=False):
+    """Regenerate derivatives for ``name`` unless its content hash is unchanged.
+
+    Runs in a pool process. Returns ``(name, status, source_bytes,
+    optimized_bytes, error)`` where ``optimized_bytes`` is the size of the
+    largest variant in the smallest format a browser would pick.
+    """
+    try:
+        with default_storage.open(name, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        manifest = read_manifest(name)
+        if not force and manifest is not None and manifest.get('sha256') == digest:
+            status = 'skipped'
+        else:
+            manifest = generate_derivatives(name)
+            status = 'optimized'
+    except FileNotFoundError:
+        return name, 'missing', 0, 0, None
+    except (OSError, UnidentifiedImageError, ValueError) as e:
+        return name, 'failed', 0, 0, str(e)
+
+    largest = [sizes[-1] for sizes in manifest.get('bytes', {}).values() if sizes]
+    source_bytes = manifest.get('source_bytes', 0)
+    return name, status, source_bytes, min(largest) if largest else source_bytes, None
+
+
+class Command(BaseCommand):
+    help = 'Regenerate responsive derivatives for every stored image'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=os.cpu_count() or 1,
+            help='Number of pool processes (default: CPU count)',
+        )
+        parser.add_argument(
+            '--checkpoint', default=str(settings.BASE_DIR / '.optimize_media_checkpoint.json'),
+            help='File recording finished images so an interrupted run can resume',
+        )
+        parser.add_argument(
+            '--restart', action='store_true',
+            help='Ignore an existing checkpoint and start from scratch',
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Regenerate derivatives even when the source hash is unchanged',
+        )
+
+    def image_names(self):
+        """Distinct stored file names across every ImageField"""
+        names = set()
+        for model in IMAGE_MODELS:
+            for field in model._meta.fields:
+                if isinstance(field, ImageField):
+                    names.update(
+                        model.objects.exclude(**{field.name: ''}).exclude(**{f'{field.name}__isnull': True})
+                        .values_list(field.name, flat=True).iterator()
+                    )
+        return sorted(names)
+
+    def load_checkpoint(self, path):
+        try:
+            with open(path) as f:
+                return set(json.load(f)['done'])
+        except (OSError, ValueError, KeyError):
+            return set()
+
+    def save_checkpoint(self, path, done):
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'done': sorted(done)}, f)
+        os.replace(tmp_path, path)
+
+    def handle(self, *args, **options):
+        checkpoint = options['checkpoint']
+        done = set() if options['restart'] else self.load_checkpoint(checkpoint)
+        names = [name for name in self.image_names() if name not in done]
+        if done:
+            self.stdout.write(f'Resuming: {len(done)} image(s) already processed')
+        self.stdout.write(f'Optimizing {len(names)} image(s) with {options["processes"]} process(es)...')
+
+        counts = {'optimized': 0, 'skipped': 0, 'missing': 0, 'failed': 0}
+        source_total = optimized_total = 0
+        started = time.monotonic()
+
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=max(1, options['processes']), initializer=init_pool_process) as executor:
+            futures = [executor.submit(optimize_file, name, options['force']) for name in names]
+            try:
+                for i, future in enumerate(as_completed(futures), 1):
+                    name, status, source_bytes, optimized_bytes, error = future.result()
+                    counts[status] += 1
+                    if status == 'failed':
+                        self.stdout.write(self.style.ERROR(f'✗ {name}: {error}'))
+                        continue
+                    if status == 'missing':
+                        self.stdout.write(self.style.WARNING(f'! Missing file: {name}'))
+                    source_total += source_bytes
+                    optimized_total += optimized_bytes
+                    done.add(name)
+                    if i % CHECKPOINT_EVERY == 0:
+                        self.save_checkpoint(checkpoint, done)
+            except KeyboardInterrupt:
+                for future in futures:
+                    future.cancel()
+                self.save_checkpoint(checkpoint, done)
+                self.stdout.write(self.style.WARNING('Interrupted; rerun to resume from the checkpoint'))
+                return
+
+        elapsed = time.monotonic() - started
+        if counts['failed']:
+            self.save_checkpoint(checkpoint, done)
+        elif os.path.exists(checkpoint):
+            os.remove(checkpoint)
+
+        processed = counts['optimized'] + counts['skipped']
+        saved = source_total - optimized_total
+        self.stdout.write(
+            f"Optimized {counts['optimized']}, skipped {counts['skipped']} unchanged, "
+            f"{counts['missing']} missing, {counts['failed']} failed"
+        )
+        self.stdout.write(
+            f'Originals {source_total / 1024:.0f} KB -> largest variants {optimized_total / 1024:.0f} KB '
+            f'({saved / 1024:.0f} KB saved)'
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ {processed} image(s) in {elapsed:.1f}s ({processed / elapsed if elapsed else 0:.1f} images/s)'
+        ))
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.outbox import send_pending
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued contact form notification emails'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='Emails sent per SMTP connection (default: CONTACT_EMAIL_BATCH_SIZE)',
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=5.0,
+            help='Seconds to sleep when nothing is due',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Send everything that is due and exit instead of polling forever',
+        )
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        try:
+            while True:
+                close_old_connections()
+                sent, failed = send_pending(options['batch_size'])
+                total_sent += sent
+                total_failed += failed
+                if sent or failed:
+                    self.stdout.write(f'Sent {sent}, failed {failed}')
+                elif options['once']:
+                    break
+                else:
+                    time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping email sender')
+        self.stdout.write(self.style.SUCCESS(f'✓ Sent {total_sent} email(s), {total_failed} failure(s)'))
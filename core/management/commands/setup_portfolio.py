@@ -1,13 +1,32 @@
 from django.core.management.base import BaseCommand
 from django.core.files import File
 from core.models import Service, Project, PortfolioImage, Testimonial, SiteSetting, Technology
+from core.synthetic import SCALE, build_dataset, placeholder_images
 from datetime import date, timedelta
 import os
+import time
 
 class Command(BaseCommand):
     help = 'Setup portfolio with sample data'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', type=int, default=0,
+            help=f'Bulk-generate synthetic data instead: N x {sum(SCALE.values())} rows plus M2M links',
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Random seed for --scale; the same seed always produces the same data',
+        )
+        parser.add_argument(
+            '--placeholders', type=int, default=24,
+            help='Distinct Pillow placeholder images per image field for --scale (default: 24)',
+        )
+
     def handle(self, *args, **options):
+        if options['scale']:
+            return self.generate(options['scale'], options['seed'], options['placeholders'])
+
         self.stdout.write('Setting up portfolio sample data...')
         
         # Create Site Settings
@@ -199,4 +218,26 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.SUCCESS(f'✓ Created testimonial: {testimonial_data["client_name"]}'))
         
         self.stdout.write(self.style.SUCCESS('✓ Portfolio setup completed successfully!'))
-        self.stdout.write(self.style.SUCCESS('✓ You can now run the development server and visit /admin to manage your portfolio.'))
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS('✓ You can now run the development server and visit /admin to manage your portfolio.'))
+
+    def generate(self, scale, seed, placeholder_count):
+        """Bulk-insert a large synthetic portfolio for load testing"""
+        self.stdout.write(f'Generating synthetic data at scale {scale} (seed {seed})...')
+        started = time.monotonic()
+        SiteSetting.objects.get_or_create(id=1, defaults={'site_name': 'DevPortfolio'})
+
+        placeholders = {
+            directory: placeholder_images(directory, max(1, placeholder_count), seed)
+            for directory in ('projects', 'portfolio/images')
+        }
+        self.stdout.write(self.style.SUCCESS(f'✓ Saved {sum(map(len, placeholders.values()))} placeholder images'))
+
+        counts = build_dataset(
+            scale, seed, image_name=lambda directory, i: placeholders[directory][i % len(placeholders[directory])],
+        )
+        for name, count in counts.items():
+            self.stdout.write(self.style.SUCCESS(f'✓ Created {count} {name.replace("_", " ")}'))
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Synthetic data ready in {time.monotonic() - started:.1f}s; '
+            f'run `manage.py optimize_media` to build responsive image derivatives'
+        ))
\ No newline at end of file
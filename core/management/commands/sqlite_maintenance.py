@@ -0,0 +1,57 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPORTED_PRAGMAS = [
+    'journal_mode', 'synchronous', 'mmap_size', 'cache_size', 'busy_timeout',
+    'temp_store', 'page_size', 'page_count', 'freelist_count',
+]
+
+
+class Command(BaseCommand):
+    help = 'Report SQLite pragmas and optionally run VACUUM / ANALYZE'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help='Database alias (default: "default")',
+        )
+        parser.add_argument(
+            '--vacuum', action='store_true',
+            help='Rebuild the database file to reclaim free pages',
+        )
+        parser.add_argument(
+            '--analyze', action='store_true',
+            help='Refresh query planner statistics (ANALYZE, then PRAGMA optimize)',
+        )
+
+    def report(self, cursor):
+        for pragma in REPORTED_PRAGMAS:
+            cursor.execute(f'PRAGMA {pragma}')
+            row = cursor.fetchone()
+            self.stdout.write(f'{pragma:>15}: {row[0] if row else ""}')
+
+    def timed(self, cursor, sql):
+        started = time.monotonic()
+        cursor.execute(sql)
+        self.stdout.write(self.style.SUCCESS(f'✓ {sql} in {time.monotonic() - started:.2f}s'))
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError(f'Database "{options["database"]}" is {connection.vendor}, not SQLite')
+
+        name = str(connection.settings_dict['NAME'])
+        size = os.path.getsize(name) if os.path.exists(name) else 0
+        self.stdout.write(f'{name} ({size / 1024:.0f} KB)')
+        with connection.cursor() as cursor:
+            self.report(cursor)
+            if options['analyze']:
+                self.timed(cursor, 'ANALYZE')
+                self.timed(cursor, 'PRAGMA optimize')
+            if options['vacuum']:
+                self.timed(cursor, 'VACUUM')
+        if options['vacuum'] and os.path.exists(name):
+            self.stdout.write(f'Size after VACUUM: {os.path.getsize(name) / 1024:.0f} KB')
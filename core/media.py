@@ -0,0 +1,94 @@
+"""Content-hashed media storage.
+
+Uploads (and image derivatives) are stored as ``<stem>.<sha256[:12]>.<ext>``,
+so a URL always refers to the same bytes and can be cached forever.
+Compressible files get ``.gz`` (and ``.br`` when ``brotli`` is installed)
+siblings that ``core.middleware.MediaFilesMiddleware`` negotiates via
+``Accept-Encoding``.
+"""
+import gzip
+import hashlib
+import posixpath
+import re
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+HASH_LENGTH = 12
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{%d}\.[^./]+$' % HASH_LENGTH)
+
+# Image formats are already compressed; only these benefit from gzip/brotli
+COMPRESSIBLE_EXTENSIONS = {'.svg', '.json', '.txt', '.xml', '.css', '.js', '.ico', '.bmp', '.tif', '.tiff'}
+
+# Files looked up by a fixed name (derivative manifests) keep their name
+UNHASHED_NAMES = {'manifest.json'}
+
+# Matches the default FileField/ImageField max_length
+MAX_NAME_LENGTH = 100
+
+
+def is_hashed_name(name):
+    return bool(HASHED_NAME_RE.search(name))
+
+
+def content_hash(content):
+    sha256 = hashlib.sha256()
+    for chunk in content.chunks():
+        sha256.update(chunk)
+    return sha256.hexdigest()[:HASH_LENGTH]
+
+
+class HashedMediaStorage(FileSystemStorage):
+    """File system storage that names files after their content"""
+
+    def hashed_name(self, name, content):
+        if is_hashed_name(name):
+            return name
+        directory, filename = posixpath.split(name)
+        stem, ext = posixpath.splitext(filename)
+        suffix = f'.{content_hash(content)}{ext}'
+        room = MAX_NAME_LENGTH - len(suffix) - (len(directory) + 1 if directory else 0)
+        return posixpath.join(directory, stem[:max(room, 1)] + suffix)
+
+    def get_available_name(self, name, max_length=None):
+        # Hashed names can only collide with identical content, which
+        # _save() deduplicates, so there is no need for a random suffix
+        if posixpath.basename(name) in UNHASHED_NAMES:
+            return super().get_available_name(name, max_length)
+        return name
+
+    def _save(self, name, content):
+        if posixpath.basename(name) not in UNHASHED_NAMES:
+            name = self.hashed_name(name, content)
+            if self.exists(name):
+                # Same name means same bytes: nothing to write
+                return name
+        name = super()._save(name, content)
+        self.compress(name)
+        return name
+
+    def compress(self, name):
+        """Write pre-compressed siblings for compressible files"""
+        if posixpath.splitext(name)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+            return
+        with self.open(name, 'rb') as f:
+            data = f.read()
+        variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', brotli.compress(data)))
+        for suffix, compressed in variants:
+            if len(compressed) < len(data):
+                if self.exists(name + suffix):
+                    super().delete(name + suffix)
+                super()._save(name + suffix, ContentFile(compressed))
+
+    def delete(self, name):
+        super().delete(name)
+        for suffix in ('.gz', '.br'):
+            if self.exists(name + suffix):
+                super().delete(name + suffix)
@@ -0,0 +1,229 @@
+"""In-process metrics with Prometheus text exposition.
+
+Counters and histograms are kept in a process-local registry. When
+``METRICS_DIR`` is set, every worker process also writes a snapshot of
+its registry to ``<METRICS_DIR>/<pid>.json`` every
+``METRICS_FLUSH_INTERVAL`` seconds; the ``/metrics`` view merges all
+snapshots, so a scrape of any gunicorn/uvicorn worker reports the whole
+server. Scrapes only copy the registry under its lock and read files, so
+they never hold up requests being served by other threads.
+"""
+import json
+import os
+import threading
+import time
+
+from django.conf import settings
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label_key(labels):
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in sorted(labels.items()))
+
+
+class Counter:
+    type = 'counter'
+
+    def __init__(self, registry, name, documentation):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+
+    def inc(self, amount=1, **labels):
+        self.registry.add(self.name, _label_key(labels), amount)
+
+
+class Histogram:
+    type = 'histogram'
+
+    def __init__(self, registry, name, documentation, buckets):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        self.registry.observe(self, _label_key(labels), value)
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.metrics = {}
+        self.values = {}
+        self._last_flush = time.monotonic()
+
+    def counter(self, name, documentation):
+        return self._register(Counter(self, name, documentation))
+
+    def histogram(self, name, documentation, buckets=DURATION_BUCKETS):
+        return self._register(Histogram(self, name, documentation, buckets))
+
+    def _register(self, metric):
+        self.metrics[metric.name] = metric
+        self.values[metric.name] = {}
+        return metric
+
+    def add(self, name, key, amount):
+        with self._lock:
+            series = self.values[name]
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, histogram, key, value):
+        with self._lock:
+            series = self.values[histogram.name]
+            # Per-bucket (not cumulative) counts, then sum and count
+            state = series.get(key)
+            if state is None:
+                state = series[key] = [0] * (len(histogram.buckets) + 1) + [0, 0]
+            for i, bound in enumerate(histogram.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            else:
+                state[len(histogram.buckets)] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                name: {key: list(value) if isinstance(value, list) else value for key, value in series.items()}
+                for name, series in self.values.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            for series in self.values.values():
+                series.clear()
+
+    def flush(self, directory):
+        """Write this process's snapshot to ``directory`` atomically"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'{os.getpid()}.json')
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+        self._last_flush = time.monotonic()
+
+    def maybe_flush(self):
+        directory = metrics_dir()
+        if directory and time.monotonic() - self._last_flush >= getattr(settings, 'METRICS_FLUSH_INTERVAL', 5):
+            self.flush(directory)
+
+    def collect(self):
+        """Snapshot merged across every worker that has written to ``METRICS_DIR``"""
+        snapshot = self.snapshot()
+        directory = metrics_dir()
+        if not directory:
+            return snapshot
+        self.flush(directory)
+        own = f'{os.getpid()}.json'
+        merged = snapshot
+        for filename in os.listdir(directory):
+            if not filename.endswith('.json') or filename == own:
+                continue
+            try:
+                with open(os.path.join(directory, filename)) as f:
+                    merged = merge(merged, json.load(f))
+            except (OSError, ValueError):
+                continue
+        return merged
+
+
+def merge(left, right):
+    merged = {name: dict(series) for name, series in left.items()}
+    for name, series in right.items():
+        target = merged.setdefault(name, {})
+        for key, value in series.items():
+            current = target.get(key)
+            if current is None:
+                target[key] = value
+            elif isinstance(value, list):
+                target[key] = [a + b for a, b in zip(current, value)]
+            else:
+                target[key] = current + value
+    return merged
+
+
+def _format(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _labels(key, extra=''):
+    labels = ','.join(part for part in (key, extra) if part)
+    return f'{{{labels}}}' if labels else ''
+
+
+def render(registry, snapshot, gauges=()):
+    """Prometheus text format for ``snapshot``.
+
+    ``gauges`` are ``(name, help, values)`` computed at scrape time, where
+    ``values`` maps label tuples like ``(('state', 'due'),)`` to numbers.
+    """
+    lines = []
+    for name, metric in registry.metrics.items():
+        lines.append(f'# HELP {name} {metric.documentation}')
+        lines.append(f'# TYPE {name} {metric.type}')
+        for key, value in sorted(snapshot.get(name, {}).items()):
+            if metric.type == 'counter':
+                lines.append(f'{name}{_labels(key)} {_format(value)}')
+                continue
+            cumulative = 0
+            for bound, count in zip(metric.buckets + ('+Inf',), value):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f'{name}_bucket{_labels(key, le)} {cumulative}')
+            lines.append(f'{name}_sum{_labels(key)} {_format(value[-2])}')
+            lines.append(f'{name}_count{_labels(key)} {value[-1]}')
+    for name, documentation, values in gauges:
+        lines.append(f'# HELP {name} {documentation}')
+        lines.append(f'# TYPE {name} gauge')
+        for labels, value in values.items():
+            lines.append(f'{name}{_labels(_label_key(dict(labels)))} {_format(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_enabled():
+    return getattr(settings, 'METRICS_ENABLED', False)
+
+
+def metrics_dir():
+    return getattr(settings, 'METRICS_DIR', None)
+
+
+registry = Registry()
+
+HTTP_REQUESTS = registry.counter(
+    'portfolio_http_requests_total', 'HTTP requests by URL name, method and status code',
+)
+HTTP_DURATION = registry.histogram(
+    'portfolio_http_request_duration_seconds', 'Time spent handling requests by URL name',
+)
+HTTP_RESPONSE_SIZE = registry.histogram(
+    'portfolio_http_response_size_bytes', 'Response body size by URL name', SIZE_BUCKETS,
+)
+DB_QUERIES = registry.histogram(
+    'portfolio_db_queries_per_request', 'Database queries per request by URL name', QUERY_BUCKETS,
+)
+CONTACT_SUBMISSIONS = registry.counter(
+    'portfolio_contact_submissions_total', 'Contact form submissions saved',
+)
+CACHE_REQUESTS = registry.counter(
+    'portfolio_cache_requests_total', 'Application cache lookups by cache and result (hit/miss)',
+)
+RATE_LIMITED = registry.counter(
+    'portfolio_rate_limit_requests_total', 'Throttled endpoint requests by scope and outcome',
+)
+
+
+def record_cache(cache, hit):
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
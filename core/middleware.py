@@ -0,0 +1,255 @@
+import logging
+import time
+from urllib.parse import urlparse
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.urls import reverse
+from whitenoise.base import WhiteNoise
+from whitenoise.middleware import WhiteNoiseMiddleware
+from whitenoise.string_utils import ensure_leading_trailing_slash
+
+from .database import pin_to_primary, unpin
+from .instrumentation import QueryInspector, RequestTimer, instrument_templates, query_report
+from .media import is_hashed_name
+from . import metrics
+
+timing_logger = logging.getLogger('core.timing')
+
+
+class AsyncCapableMiddleware:
+    """Base for middleware that runs natively under both WSGI and ASGI.
+
+    Subclasses implement ``__call__`` and ``__acall__``. Under ASGI every
+    sync-only middleware makes Django hop to a thread and back for each
+    request, so the always-on middleware here supports both modes. The
+    opt-in diagnostics (timing, query inspection, metrics) stay sync-only
+    and bring the hop back while enabled.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """``WhiteNoiseMiddleware`` that also runs without a thread under ASGI"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def _find(self, request):
+        if self.autorefresh:
+            return self.find_file(request.path_info)
+        return self.files.get(request.path_info)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        static_file = self._find(request)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
+
+
+class MediaFilesMiddleware(AsyncCapableMiddleware):
+    """Serve ``MEDIA_URL`` through WhiteNoise's file responder.
+
+    Responses get ``ETag``/``Last-Modified``, conditional and ``Range``
+    handling and gzip/brotli negotiation. Content-hashed files are served
+    with ``Cache-Control: immutable`` for a year; anything else (uploads
+    that predate hashing) gets ``MEDIA_MAX_AGE``. Unlike static files,
+    uploads appear at runtime, so files are looked up on demand; hashed
+    ones are remembered since their contents can never change.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.prefix = ensure_leading_trailing_slash(urlparse(settings.MEDIA_URL).path)
+        self.whitenoise = WhiteNoise(
+            None,
+            autorefresh=True,
+            max_age=getattr(settings, 'MEDIA_MAX_AGE', 60),
+            immutable_file_test=lambda path, url: is_hashed_name(url),
+        )
+        self.whitenoise.add_files(settings.MEDIA_ROOT, self.prefix)
+        self.files = {}
+
+    def find_file(self, url):
+        static_file = self.files.get(url)
+        if static_file is None:
+            static_file = self.whitenoise.find_file(url)
+            if static_file is not None and is_hashed_name(url):
+                self.files[url] = static_file
+        return static_file
+
+    def _serve(self, request):
+        if request.path_info.startswith(self.prefix) and request.method in ('GET', 'HEAD'):
+            static_file = self.find_file(request.path_info)
+            if static_file is not None:
+                return WhiteNoiseMiddleware.serve(static_file, request)
+        return None
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self._serve(request) or self.get_response(request)
+
+    async def __acall__(self, request):
+        return self._serve(request) or await self.get_response(request)
+
+
+class DatabaseRoutingMiddleware(AsyncCapableMiddleware):
+    """Pin unsafe requests and the admin to the primary database.
+
+    Safe requests to the public site start unpinned, so their reads go to
+    the replica until something writes (see ``core.database``).
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.admin_prefix = reverse('admin:index')
+
+    def _pin(self, request):
+        safe = request.method in ('GET', 'HEAD', 'OPTIONS')
+        return pin_to_primary(not safe or request.path_info.startswith(self.admin_prefix))
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = self._pin(request)
+        try:
+            return self.get_response(request)
+        finally:
+            unpin(token)
+
+    async def __acall__(self, request):
+        token = self._pin(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            unpin(token)
+
+
+class RequestTimingMiddleware:
+    """Report query count, DB, template and view time for every request.
+
+    Enabled by ``REQUEST_TIMING_ENABLED``; otherwise Django drops it from
+    the stack at startup and it costs nothing. Figures are sent as a
+    ``Server-Timing`` header (unless ``REQUEST_TIMING_HEADER`` is off) and
+    logged as one ``core.timing`` line per request. Keep it last in
+    ``MIDDLEWARE`` so ``view`` covers little besides the view itself.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_TIMING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.header = getattr(settings, 'REQUEST_TIMING_HEADER', True)
+        instrument_templates()
+
+    def __call__(self, request):
+        timer = RequestTimer()
+        timer.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            timer.stop()
+
+        if self.header:
+            response['Server-Timing'] = timer.server_timing()
+        if timing_logger.isEnabledFor(logging.INFO):
+            match = request.resolver_match
+            fields = {
+                'method': request.method,
+                'path': request.path,
+                'view': match.view_name if match else None,
+                'status': response.status_code,
+                **timer.as_dict(),
+            }
+            timing_logger.info(
+                ' '.join(f'{key}={value}' for key, value in fields.items()), extra={'timing': fields},
+            )
+        return response
+
+
+class QueryInspectionMiddleware:
+    """Log slow and repeated queries with the view and code that ran them.
+
+    Enabled by ``QUERY_INSPECTION_ENABLED``. Queries slower than
+    ``SLOW_QUERY_THRESHOLD_MS`` and the same parameterized SQL (N+1
+    loops, filters differing only in values)
+    run ``DUPLICATE_QUERY_THRESHOLD`` or more times in one request are
+    logged to ``core.queries``; every ``QUERY_REPORT_INTERVAL`` seconds the
+    worst patterns across requests are logged as a summary.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_INSPECTION_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_threshold = getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 100) / 1000
+        self.duplicate_threshold = max(2, getattr(settings, 'DUPLICATE_QUERY_THRESHOLD', 2))
+        self.report_interval = getattr(settings, 'QUERY_REPORT_INTERVAL', 300)
+
+    def __call__(self, request):
+        inspector = QueryInspector(
+            slow_threshold=self.slow_threshold, duplicate_threshold=self.duplicate_threshold,
+        )
+        request._query_inspector = inspector
+        with inspector.activate():
+            response = self.get_response(request)
+        inspector.finish()
+        query_report.log_if_due(self.report_interval)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._query_inspector.view = request.resolver_match.view_name
+
+
+class MetricsMiddleware:
+    """Record latency, response size and query count per URL name.
+
+    Enabled by ``METRICS_ENABLED``. Requests that match no route are
+    recorded as ``<unmatched>`` so scanners cannot blow up the number of
+    series. Figures go to the process registry in ``core.metrics`` and are
+    shared with the other workers through ``METRICS_DIR``.
+    """
+
+    def __init__(self, get_response):
+        if not metrics.metrics_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = RequestTimer()
+        timer.start()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            duration = time.perf_counter() - started
+            timer.stop()
+
+        match = request.resolver_match
+        view = match.view_name if match else '<unmatched>'
+        metrics.HTTP_REQUESTS.inc(view=view, method=request.method, status=response.status_code)
+        metrics.HTTP_DURATION.observe(duration, view=view)
+        metrics.DB_QUERIES.observe(timer.queries, view=view)
+        if not response.streaming:
+            metrics.HTTP_RESPONSE_SIZE.observe(len(response.content), view=view)
+        metrics.registry.maybe_flush()
+        return response
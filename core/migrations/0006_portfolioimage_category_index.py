@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_contactsubmission_technology_project_github_url_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='portfolioimage',
+            index=models.Index(fields=['category', 'is_active', 'order'], name='core_pimg_cat_active_order_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_imagejob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='portfolioimage',
+            index=models.Index(fields=['created_at'], name='core_pimg_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['updated_at'], name='core_project_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['updated_at'], name='core_service_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testimonial',
+            index=models.Index(fields=['created_at'], name='core_testimonial_created_idx'),
+        ),
+    ]
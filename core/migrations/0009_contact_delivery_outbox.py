@@ -0,0 +1,49 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:50
+
+from django.db import migrations, models
+
+
+def mark_existing_delivered(apps, schema_editor):
+    # Submissions made before the outbox were emailed synchronously
+    ContactSubmission = apps.get_model('core', 'ContactSubmission')
+    ContactSubmission.objects.update(delivery_status='sent')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_timestamp_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactsubmission',
+            name='delivered_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='contactsubmission',
+            name='delivery_attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='contactsubmission',
+            name='delivery_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', help_text='Notification email status', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='contactsubmission',
+            name='last_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='contactsubmission',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='contactsubmission',
+            index=models.Index(fields=['delivery_status', 'next_attempt_at'], name='core_contact_outbox_idx'),
+        ),
+        migrations.RunPython(mark_existing_delivered, migrations.RunPython.noop),
+    ]
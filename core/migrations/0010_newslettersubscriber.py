@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_contact_delivery_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsletterSubscriber',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('email', models.EmailField(help_text='Stored lowercased and stripped', max_length=254, unique=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('subscribed_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Newsletter Subscriber',
+                'verbose_name_plural': 'Newsletter Subscribers',
+                'ordering': ['-subscribed_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_newslettersubscriber'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='portfolioimage',
+            name='core_pimg_cat_active_order_idx',
+        ),
+        migrations.AddIndex(
+            model_name='contactsubmission',
+            index=models.Index(condition=models.Q(('read', False)), fields=['-submitted_at'], name='core_contact_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='portfolioimage',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['category', 'order', '-created_at'], name='core_pimg_active_cat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('is_featured', True)), fields=['order', '-created_at'], name='core_project_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['order', '-completion_date', 'id'], name='core_project_listing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_featured', True)), fields=['order', 'created_at'], name='core_service_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'created_at'], name='core_service_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='technology',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['category', 'order', 'name'], name='core_tech_active_cat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testimonial',
+            index=models.Index(condition=models.Q(('is_featured', True)), fields=['order', '-created_at'], name='core_testimonial_featured_idx'),
+        ),
+    ]
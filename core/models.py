@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.utils.text import slugify
 from django.core.validators import MinValueValidator, MaxValueValidator
 
@@ -51,6 +52,16 @@ class Service(models.Model):
 
     class Meta:
         ordering = ['order', 'created_at']
+        indexes = [
+            models.Index(fields=['updated_at'], name='core_service_updated_idx'),
+            # Boolean filters compile to bare `WHERE "is_active"`, which only
+            # partial indexes can serve; the columns follow Meta.ordering
+            models.Index(
+                fields=['order', 'created_at'], condition=Q(is_active=True, is_featured=True),
+                name='core_service_featured_idx',
+            ),
+            models.Index(fields=['order', 'created_at'], condition=Q(is_active=True), name='core_service_active_idx'),
+        ]
         verbose_name = "Service"
         verbose_name_plural = "Services"
 
@@ -106,6 +117,12 @@ class Project(models.Model):
 
     class Meta:
         ordering = ['order', '-created_at']
+        indexes = [
+            models.Index(fields=['updated_at'], name='core_project_updated_idx'),
+            models.Index(fields=['order', '-created_at'], condition=Q(is_featured=True), name='core_project_featured_idx'),
+            # Keyset pagination order (core.pagination.project_ordering)
+            models.Index(fields=['order', '-completion_date', 'id'], name='core_project_listing_idx'),
+        ]
         verbose_name = "Project"
         verbose_name_plural = "Projects"
 
@@ -137,6 +154,14 @@ class PortfolioImage(models.Model):
 
     class Meta:
         ordering = ['category', 'order', '-created_at']
+        indexes = [
+            # SectionImages loads every active image in Meta.ordering
+            models.Index(
+                fields=['category', 'order', '-created_at'], condition=Q(is_active=True),
+                name='core_pimg_active_cat_idx',
+            ),
+            models.Index(fields=['created_at'], name='core_pimg_created_idx'),
+        ]
         verbose_name = "Portfolio Image"
         verbose_name_plural = "Portfolio Images"
 
@@ -163,6 +188,12 @@ class Testimonial(models.Model):
 
     class Meta:
         ordering = ['order', '-created_at']
+        indexes = [
+            models.Index(fields=['created_at'], name='core_testimonial_created_idx'),
+            models.Index(
+                fields=['order', '-created_at'], condition=Q(is_featured=True), name='core_testimonial_featured_idx',
+            ),
+        ]
         verbose_name = "Testimonial"
         verbose_name_plural = "Testimonials"
 
@@ -170,15 +201,38 @@ class Testimonial(models.Model):
         return f"{self.client_name} - {self.company}"
 
 class ContactSubmission(models.Model):
+    DELIVERY_PENDING = 'pending'
+    DELIVERY_SENT = 'sent'
+    DELIVERY_FAILED = 'failed'
+    DELIVERY_CHOICES = [
+        (DELIVERY_PENDING, 'Pending'),
+        (DELIVERY_SENT, 'Sent'),
+        (DELIVERY_FAILED, 'Failed'),
+    ]
+
     name = models.CharField(max_length=200)
     email = models.EmailField()
     subject = models.CharField(max_length=200)
     message = models.TextField()
     submitted_at = models.DateTimeField(auto_now_add=True)
     read = models.BooleanField(default=False)
+    delivery_status = models.CharField(
+        max_length=10,
+        choices=DELIVERY_CHOICES,
+        default=DELIVERY_PENDING,
+        help_text="Notification email status"
+    )
+    delivery_attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
     
     class Meta:
         ordering = ['-submitted_at']
+        indexes = [
+            models.Index(fields=['delivery_status', 'next_attempt_at'], name='core_contact_outbox_idx'),
+            models.Index(fields=['-submitted_at'], condition=Q(read=False), name='core_contact_unread_idx'),
+        ]
         verbose_name = "Contact Submission"
         verbose_name_plural = "Contact Submissions"
     
@@ -258,6 +312,67 @@ class Technology(models.Model):
     class Meta:
         verbose_name_plural = "Technologies"
         ordering = ['category', 'order', 'name']
+        indexes = [
+            models.Index(fields=['category', 'order', 'name'], condition=Q(is_active=True), name='core_tech_active_cat_idx'),
+        ]
     
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+class ImageJob(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    file_name = models.CharField(max_length=255, help_text="Storage name of the source image")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='core_imagejob_status_idx'),
+        ]
+        verbose_name = "Image Job"
+        verbose_name_plural = "Image Jobs"
+
+    def __str__(self):
+        return f"{self.file_name} ({self.get_status_display()})"
+
+class NewsletterSubscriber(models.Model):
+    email = models.EmailField(unique=True, help_text="Stored lowercased and stripped")
+    is_active = models.BooleanField(default=True)
+    subscribed_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-subscribed_at']
+        verbose_name = "Newsletter Subscriber"
+        verbose_name_plural = "Newsletter Subscribers"
+
+    def __str__(self):
+        return self.email
+
+    @staticmethod
+    def normalize_email(email):
+        return email.strip().lower()
+
+    @classmethod
+    def subscribe(cls, email):
+        """Insert or reactivate ``email`` in a single INSERT ... ON CONFLICT statement"""
+        cls.objects.bulk_create(
+            [cls(email=cls.normalize_email(email))],
+            update_conflicts=True,
+            unique_fields=['email'],
+            update_fields=['is_active', 'updated_at'],
+        )
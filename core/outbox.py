@@ -0,0 +1,137 @@
+"""Outbox for contact-form notification emails.
+
+The contact view only stores a ``ContactSubmission``; ``manage.py
+send_contact_emails`` drains pending rows in batches over one SMTP
+connection, retrying failures with exponential backoff. Rows are claimed
+with a conditional UPDATE before sending, so overlapping senders never
+deliver the same submission twice.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import ContactSubmission
+
+logger = logging.getLogger(__name__)
+
+
+def max_attempts():
+    return getattr(settings, 'CONTACT_EMAIL_MAX_ATTEMPTS', 6)
+
+
+def retry_delay(attempts):
+    """Seconds to wait before attempt number ``attempts + 1``"""
+    base = getattr(settings, 'CONTACT_EMAIL_RETRY_BASE', 30)
+    cap = getattr(settings, 'CONTACT_EMAIL_RETRY_MAX', 3600)
+    return min(base * 2 ** (attempts - 1), cap)
+
+
+def build_message(submission, connection=None):
+    return EmailMessage(
+        subject=f'Portfolio Contact: {submission.subject}',
+        body=f'Name: {submission.name}\nEmail: {submission.email}\n\nMessage:\n{submission.message}',
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[getattr(settings, 'CONTACT_EMAIL_RECIPIENT', settings.DEFAULT_FROM_EMAIL)],
+        reply_to=[submission.email],
+        connection=connection,
+    )
+
+
+def due_submissions(now=None):
+    now = now or timezone.now()
+    return ContactSubmission.objects.filter(
+        Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now),
+        delivery_status=ContactSubmission.DELIVERY_PENDING,
+    ).order_by('submitted_at')
+
+
+def claim_timeout():
+    """Seconds a claimed submission stays hidden from other senders"""
+    return getattr(settings, 'CONTACT_EMAIL_CLAIM_TIMEOUT', 600)
+
+
+def claim_submissions(limit):
+    """Claim up to ``limit`` due submissions for this sender and return them.
+
+    Claiming counts the attempt and pushes ``next_attempt_at`` past the
+    claim timeout; the ``UPDATE`` only matches while the row still has the
+    attempt count we read, so a concurrent sender's claim wins outright.
+    A sender that dies mid-batch leaves its rows due again once the
+    timeout passes.
+    """
+    claimed = []
+    due = due_submissions().values_list('pk', 'delivery_attempts')[:limit]
+    for pk, attempts in list(due):
+        updated = ContactSubmission.objects.filter(
+            pk=pk, delivery_status=ContactSubmission.DELIVERY_PENDING, delivery_attempts=attempts,
+        ).update(
+            delivery_attempts=F('delivery_attempts') + 1,
+            next_attempt_at=timezone.now() + timedelta(seconds=claim_timeout()),
+        )
+        if updated:
+            claimed.append(pk)
+    return list(ContactSubmission.objects.filter(pk__in=claimed).order_by('submitted_at'))
+
+
+def _record_failure(submission, error):
+    submission.last_error = f'{type(error).__name__}: {error}'
+    if submission.delivery_attempts >= max_attempts():
+        submission.delivery_status = ContactSubmission.DELIVERY_FAILED
+        submission.next_attempt_at = None
+    else:
+        delay = retry_delay(submission.delivery_attempts)
+        submission.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+    logger.warning(
+        "Contact email %s failed (attempt %s): %s",
+        submission.pk, submission.delivery_attempts, submission.last_error,
+    )
+
+
+def _record_success(submission):
+    submission.delivery_status = ContactSubmission.DELIVERY_SENT
+    submission.delivered_at = timezone.now()
+    submission.next_attempt_at = None
+    submission.last_error = ''
+
+
+def _save(submission):
+    submission.save(update_fields=[
+        'delivery_status', 'delivery_attempts', 'next_attempt_at', 'delivered_at', 'last_error',
+    ])
+
+
+def send_pending(batch_size=None):
+    """Send one batch of due notifications; return ``(sent, failed)`` counts"""
+    batch_size = batch_size or getattr(settings, 'CONTACT_EMAIL_BATCH_SIZE', 50)
+    submissions = claim_submissions(batch_size)
+    if not submissions:
+        return 0, 0
+
+    sent = failed = 0
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:  # unreachable server: every message in the batch failed
+        for submission in submissions:
+            _record_failure(submission, e)
+            _save(submission)
+        return 0, len(submissions)
+
+    try:
+        for submission in submissions:
+            try:
+                build_message(submission, connection).send()
+            except Exception as e:  # SMTP and socket errors vary by backend
+                failed += 1
+                _record_failure(submission, e)
+            else:
+                sent += 1
+                _record_success(submission)
+            _save(submission)
+    finally:
+        connection.close()
+    return sent, failed
@@ -0,0 +1,92 @@
+import base64
+import binascii
+import json
+from datetime import date
+
+from django.conf import settings
+from django.db.models import F, Q
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+class KeysetPage:
+    """One page of a keyset-paginated queryset"""
+
+    def __init__(self, items, next_cursor):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def encode_cursor(project):
+    """Encode the sort key of ``project`` as an opaque URL-safe token"""
+    completion_date = project.completion_date.isoformat() if project.completion_date else None
+    payload = json.dumps([project.order, completion_date, project.pk], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a token produced by ``encode_cursor`` into its sort key"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        order, completion_date, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if completion_date is not None:
+            completion_date = date.fromisoformat(completion_date)
+        return int(order), completion_date, int(pk)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}") from e
+
+
+def project_ordering():
+    """Listing order for projects: ``(order, -completion_date, id)``"""
+    return ['order', F('completion_date').desc(nulls_last=True), 'id']
+
+
+def _after(order, completion_date, pk):
+    """Rows sorting strictly after the given key in ``project_ordering``"""
+    if completion_date is None:
+        same_order = Q(completion_date__isnull=True, id__gt=pk)
+    else:
+        same_order = (
+            Q(completion_date__lt=completion_date)
+            | Q(completion_date__isnull=True)
+            | Q(completion_date=completion_date, id__gt=pk)
+        )
+    return Q(order__gt=order) | (Q(order=order) & same_order)
+
+
+def _page_queryset(queryset, cursor, page_size):
+    queryset = queryset.order_by(*project_ordering())
+    if cursor:
+        queryset = queryset.filter(_after(*decode_cursor(cursor)))
+    return queryset[:page_size + 1]
+
+
+def _page(items, page_size):
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        next_cursor = encode_cursor(items[-1])
+    return KeysetPage(items, next_cursor)
+
+
+async def apaginate_projects(queryset, cursor=None, page_size=None):
+    """Return the page of ``queryset`` that follows ``cursor``.
+
+    Only ``page_size + 1`` rows are read per call, whatever the table size;
+    the extra row tells us whether there is a next page.
+    """
+    if page_size is None:
+        page_size = settings.PROJECTS_PAGE_SIZE
+    return _page([project async for project in _page_queryset(queryset, cursor, page_size)], page_size)
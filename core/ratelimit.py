@@ -0,0 +1,187 @@
+"""Token-bucket throttling for the anonymous write endpoints.
+
+Every rule in ``settings.RATE_LIMITS`` is ``(capacity, period)``: a client
+may burst ``capacity`` requests, after which tokens refill evenly over
+``period`` seconds. Each request spends one token from the bucket of its
+client IP and one from the bucket of the submitted email address, so
+rotating either alone does not help a flood.
+
+Buckets live in process memory unless ``RATE_LIMIT_CACHE_ALIAS`` names a
+shared cache, which multi-worker deployments should use so the limit is
+enforced across workers.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, JsonResponse
+
+from .metrics import RATE_LIMITED
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE_LIMITS = {
+    'contact': (5, 600),
+    'newsletter': (3, 600),
+}
+
+# In-memory buckets beyond this count are evicted, least recently used first
+MAX_LOCAL_BUCKETS = 10000
+
+_counters_lock = threading.Lock()
+_counters = {}
+
+
+def get_rule(scope):
+    return getattr(settings, 'RATE_LIMITS', DEFAULT_RATE_LIMITS).get(scope)
+
+
+def client_ip(request):
+    """The client address, taken from X-Forwarded-For only behind a trusted proxy"""
+    if getattr(settings, 'RATE_LIMIT_TRUST_FORWARDED_FOR', False):
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def bucket_keys(request, scope):
+    keys = [f'ip:{client_ip(request)}']
+    email = (request.POST.get('email') or '').strip().lower()
+    if email:
+        keys.append('email:' + hashlib.md5(email.encode(), usedforsecurity=False).hexdigest())
+    return [f'core:ratelimit:{scope}:{key}' for key in keys]
+
+
+def _refill(bucket, capacity, period, now):
+    tokens, updated = bucket if bucket is not None else (capacity, now)
+    return min(capacity, tokens + (now - updated) * capacity / period)
+
+
+class LocalBucketStore:
+    """Buckets in a process-local LRU dict.
+
+    Rejected requests store nothing, so a throttled client rotating email
+    addresses cannot grow the dict; allowed ones beyond ``max_buckets``
+    evict the least recently used bucket.
+    """
+
+    def __init__(self, max_buckets=MAX_LOCAL_BUCKETS):
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+        self.max_buckets = max_buckets
+
+    def take(self, keys, capacity, period):
+        """Spend one token from every bucket in ``keys``; return the seconds to wait, or 0"""
+        now = time.monotonic()
+        with self._lock:
+            levels = [_refill(self._buckets.get(key), capacity, period, now) for key in keys]
+            wait = _wait(levels, capacity, period)
+            if not wait:
+                for key, tokens in zip(keys, levels):
+                    self._buckets[key] = (tokens - 1, now)
+                    self._buckets.move_to_end(key)
+                while len(self._buckets) > self.max_buckets:
+                    self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBucketStore:
+    """Buckets in a shared Django cache.
+
+    Reads and writes are not atomic, so concurrent requests from one client
+    may occasionally spend the same token; fine for throttling spam.
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    def take(self, keys, capacity, period):
+        cache = caches[self.alias]
+        now = time.time()
+        stored = cache.get_many(keys)
+        levels = [_refill(stored.get(key), capacity, period, now) for key in keys]
+        wait = _wait(levels, capacity, period)
+        if not wait:
+            cache.set_many({key: (tokens - 1, now) for key, tokens in zip(keys, levels)}, period)
+        return wait
+
+
+def _wait(levels, capacity, period):
+    """Seconds until every bucket holds a whole token (0 when all do)"""
+    return max((1 - tokens) * period / capacity if tokens < 1 else 0 for tokens in levels)
+
+
+_local_store = LocalBucketStore()
+
+
+def get_store():
+    alias = getattr(settings, 'RATE_LIMIT_CACHE_ALIAS', None)
+    return CacheBucketStore(alias) if alias else _local_store
+
+
+def _count(scope, outcome):
+    with _counters_lock:
+        counts = _counters.setdefault(scope, {'allowed': 0, 'limited': 0})
+        counts[outcome] += 1
+    RATE_LIMITED.inc(scope=scope, outcome=outcome)
+
+
+def get_counters():
+    """Allowed/limited request counts per scope since this process started"""
+    with _counters_lock:
+        return {scope: dict(counts) for scope, counts in _counters.items()}
+
+
+def reset():
+    """Forget every local bucket and counter"""
+    _local_store.clear()
+    with _counters_lock:
+        _counters.clear()
+
+
+def too_many_requests(wait, as_json=False):
+    retry_after = max(1, int(wait + 0.999))
+    if as_json:
+        response = JsonResponse(
+            {'success': False, 'message': 'Too many requests. Please try again later.'}, status=429,
+        )
+    else:
+        response = HttpResponse('Too many requests. Please try again later.', status=429, content_type='text/plain')
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
+def rate_limit(scope, methods=('POST',), as_json=False):
+    """Throttle ``methods`` requests to the decorated view under ``scope``.
+
+    Limited requests are answered with a small 429 before the view runs,
+    so they never touch the database or render a template.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            rule = get_rule(scope)
+            if (request.method not in methods or rule is None
+                    or not getattr(settings, 'RATE_LIMIT_ENABLED', True)):
+                return view(request, *args, **kwargs)
+
+            capacity, period = rule
+            wait = get_store().take(bucket_keys(request, scope), capacity, period)
+            if wait:
+                _count(scope, 'limited')
+                logger.info("Rate limited %s request from %s", scope, client_ip(request))
+                return too_many_requests(wait, as_json)
+            _count(scope, 'allowed')
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,79 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .metrics import record_cache
+from .models import PortfolioImage, Technology
+from .versions import get_version
+
+
+class SectionImages:
+    """Active portfolio images grouped by category, loaded with a single query.
+
+    Views used to run one ``filter(category=..., is_active=True)`` per page
+    section. This resolver fetches every active image once (in the model's
+    default ``category, order, -created_at`` ordering) and serves each
+    section from the in-memory grouping.
+    """
+
+    def __init__(self, queryset=None):
+        if queryset is None:
+            queryset = PortfolioImage.objects.filter(is_active=True)
+        self._queryset = queryset
+        self._by_category = None
+
+    def _load(self):
+        if self._by_category is None:
+            grouped = defaultdict(list)
+            for image in self._queryset:
+                grouped[image.category].append(image)
+            self._by_category = grouped
+        return self._by_category
+
+    async def aload(self):
+        """Fetch the images from an async view; the accessors then read memory"""
+        if self._by_category is None:
+            grouped = defaultdict(list)
+            async for image in self._queryset:
+                grouped[image.category].append(image)
+            self._by_category = grouped
+        return self
+
+    def all(self, category):
+        """Return every active image in ``category``"""
+        return self._load().get(category, [])
+
+    def first(self, category):
+        """Return the first active image in ``category`` or ``None``"""
+        images = self.all(category)
+        return images[0] if images else None
+
+    def top(self, category, limit):
+        """Return up to ``limit`` active images in ``category``"""
+        return self.all(category)[:limit]
+
+
+class TechStack:
+    """Active technologies loaded once and grouped by category"""
+
+    def __init__(self, technologies):
+        self.all = list(technologies)
+        self.by_category = {category: [] for category, _ in Technology.CATEGORY_CHOICES}
+        for tech in self.all:
+            self.by_category.setdefault(tech.category, []).append(tech)
+
+    def context(self):
+        """Template variables like ``frontend_tech`` used by about/services"""
+        return {f'{category}_tech': techs for category, techs in self.by_category.items()}
+
+
+async def aget_tech_stack():
+    """Return the shared ``TechStack``, cached until a Technology changes"""
+    key = f'core:tech_stack:{get_version("technology")}'
+    stack = cache.get(key)
+    record_cache('tech_stack', stack is not None)
+    if stack is None:
+        stack = TechStack([tech async for tech in Technology.objects.filter(is_active=True)])
+        cache.set(key, stack, getattr(settings, 'TECH_STACK_CACHE_TIMEOUT', 600))
+    return stack
@@ -0,0 +1,65 @@
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .images import generate_missing_derivatives
+from .metrics import CONTACT_SUBMISSIONS
+from .models import Service, Project, PortfolioImage, Testimonial, SiteSetting, Technology, ContactSubmission
+from .site_settings import invalidate_site_settings
+from .tasks import enqueue_derivatives
+from .versions import bump_version
+
+# Public content that cached pages and fragments are rendered from
+CONTENT_MODELS = [Service, Project, PortfolioImage, Testimonial, Technology, SiteSetting]
+
+
+@receiver([post_save, post_delete], sender=SiteSetting)
+def site_settings_changed(sender, using=None, **kwargs):
+    """Invalidate the cached site settings once the change is committed"""
+    transaction.on_commit(invalidate_site_settings, using=using)
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=PortfolioImage)
+@receiver(post_save, sender=Testimonial)
+@receiver(post_save, sender=SiteSetting)
+def image_saved(sender, instance, raw=False, **kwargs):
+    """Build (or queue) responsive derivatives for newly uploaded images"""
+    if raw or not getattr(settings, 'IMAGE_DERIVATIVES_ON_SAVE', True):
+        return
+    if getattr(settings, 'IMAGE_DERIVATIVES_QUEUE', True):
+        enqueue_derivatives(instance)
+    else:
+        generate_missing_derivatives(instance)
+
+
+@receiver(post_save, sender=ContactSubmission)
+def contact_submitted(sender, created, raw=False, **kwargs):
+    if created and not raw:
+        CONTACT_SUBMISSIONS.inc()
+
+
+def content_changed(sender, using=None, **kwargs):
+    """Bump the content version so cached pages are rebuilt.
+
+    The bump waits for the commit: bumping inside the transaction would let
+    a concurrent request cache pre-commit data under the new version.
+    """
+    transaction.on_commit(partial(bump_version, sender._meta.model_name), using=using)
+
+
+def content_relation_changed(sender, instance, action, using=None, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        transaction.on_commit(partial(bump_version, instance._meta.model_name), using=using)
+
+
+for model in CONTENT_MODELS:
+    post_save.connect(content_changed, sender=model, dispatch_uid=f'content_saved_{model._meta.model_name}')
+    post_delete.connect(content_changed, sender=model, dispatch_uid=f'content_deleted_{model._meta.model_name}')
+
+m2m_changed.connect(content_relation_changed, sender=Project.services.through)
+m2m_changed.connect(content_relation_changed, sender=Project.additional_images.through)
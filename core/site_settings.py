@@ -0,0 +1,103 @@
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError
+
+from .metrics import record_cache
+from .models import SiteSetting
+
+CACHE_KEY = 'core:site_settings'
+
+DEFAULT_SITE_SETTINGS = {
+    'site_name': "DevPortfolio",
+    'site_description': "Professional Web Development Services",
+}
+
+_lock = threading.RLock()
+_local = None  # (site_settings, expires_at)
+
+
+def _shared_cache():
+    """Return the shared cache backend configured for site settings, if any"""
+    alias = getattr(settings, 'SITE_SETTINGS_CACHE_ALIAS', None)
+    return caches[alias] if alias else None
+
+
+def _local_timeout():
+    return getattr(settings, 'SITE_SETTINGS_LOCAL_TIMEOUT', 30)
+
+
+def _load_site_settings():
+    """Read the singleton row from the database, creating it on first use"""
+    site_settings = SiteSetting.objects.first()
+    if site_settings is None:
+        site_settings = SiteSetting.objects.create(**DEFAULT_SITE_SETTINGS)
+    return site_settings
+
+
+def get_site_settings():
+    """Get site settings or create default ones.
+
+    The row is held in process memory for ``SITE_SETTINGS_LOCAL_TIMEOUT``
+    seconds (``None`` keeps it until invalidated). When
+    ``SITE_SETTINGS_CACHE_ALIAS`` names a cache from ``CACHES``, expired
+    process copies are refreshed from that shared backend instead of the
+    database, so multi-worker deployments only hit the database once per
+    change. Saves and deletes invalidate both layers (see ``core.signals``).
+    """
+    global _local
+
+    entry = _local
+    now = time.monotonic()
+    if entry is not None and (entry[1] is None or entry[1] > now):
+        return entry[0]
+
+    with _lock:
+        entry = _local
+        if entry is not None and (entry[1] is None or entry[1] > now):
+            return entry[0]
+
+        shared = _shared_cache()
+        site_settings = None
+        if shared is not None:
+            site_settings = shared.get(CACHE_KEY)
+            record_cache('site_settings', site_settings is not None)
+        if site_settings is None:
+            try:
+                site_settings = _load_site_settings()
+            except DatabaseError:
+                # Error pages must still render when the database is down;
+                # hand out unsaved defaults and try again on the next call.
+                return SiteSetting(**DEFAULT_SITE_SETTINGS)
+            if shared is not None:
+                shared.set(CACHE_KEY, site_settings, None)
+
+        timeout = _local_timeout()
+        _local = (site_settings, None if timeout is None else now + timeout)
+        return site_settings
+
+
+async def aget_site_settings():
+    """``get_site_settings`` for async views.
+
+    The in-process copy is returned straight from the event loop; only a
+    refresh is run in a thread, where the database can be used.
+    """
+    entry = _local
+    if entry is not None and (entry[1] is None or entry[1] > time.monotonic()):
+        return entry[0]
+    return await sync_to_async(get_site_settings)()
+
+
+def invalidate_site_settings():
+    """Drop the cached site settings from process memory and the shared cache"""
+    global _local
+
+    with _lock:
+        _local = None
+        shared = _shared_cache()
+        if shared is not None:
+            shared.delete(CACHE_KEY)
@@ -0,0 +1,166 @@
+"""Synthetic portfolio data for load and performance testing.
+
+``build_dataset`` bulk-inserts thousands of rows without per-row signals
+and bumps the content versions once the transaction commits, so caches
+see the new data as a single edit. Everything except timestamps is derived from the
+seed, so a given ``(scale, seed)`` always produces the same portfolio.
+"""
+import io
+import random
+from datetime import date, timedelta
+from functools import partial
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from PIL import Image, ImageDraw
+
+from .models import Service, Project, PortfolioImage, Testimonial, Technology, ContactSubmission
+from .versions import bump_version
+
+BATCH_SIZE = 500
+
+# Rows created per unit of ``scale``
+SCALE = {
+    'services': 12,
+    'projects': 1000,
+    'images': 1000,
+    'technologies': 100,
+    'testimonials': 500,
+    'contact_submissions': 500,
+}
+
+PLACEHOLDER_SIZE = (1200, 800)
+
+LOREM = (
+    "Designed, built and shipped with a focus on performance, accessibility "
+    "and maintainability. "
+)
+
+
+def placeholder_images(directory, count, seed=0, storage=default_storage):
+    """Save ``count`` solid-colour JPEG placeholders and return their stored names"""
+    rng = random.Random(f'{seed}:{directory}')
+    names = []
+    for i in range(count):
+        image = Image.new('RGB', PLACEHOLDER_SIZE, tuple(rng.randrange(40, 220) for _ in range(3)))
+        draw = ImageDraw.Draw(image)
+        draw.rectangle([40, 40, PLACEHOLDER_SIZE[0] - 40, PLACEHOLDER_SIZE[1] - 40], outline='white', width=8)
+        draw.text((80, 80), f'{directory} #{i}', fill='white')
+        buffer = io.BytesIO()
+        image.save(buffer, 'JPEG', quality=70)
+        names.append(storage.save(f'{directory}/placeholder-{i}.jpg', ContentFile(buffer.getvalue())))
+    return names
+
+
+def _insert_links(through, from_column, to_column, pairs):
+    """Insert M2M rows with executemany, skipping per-row model instances"""
+    quote = connection.ops.quote_name
+    sql = (
+        f'INSERT INTO {quote(through._meta.db_table)} ({quote(from_column)}, {quote(to_column)}) '
+        f'VALUES (%s, %s)'
+    )
+    with connection.cursor() as cursor:
+        for start in range(0, len(pairs), BATCH_SIZE * 10):
+            cursor.executemany(sql, pairs[start:start + BATCH_SIZE * 10])
+
+
+@transaction.atomic
+def build_dataset(scale=1, seed=0, image_name=None):
+    """Bulk-create a synthetic portfolio; returns the created row counts.
+
+    ``image_name(kind, index)`` returns the stored image name for each row
+    and defaults to a placeholder path that need not exist on disk.
+    """
+    rng = random.Random(seed)
+    image_name = image_name or (lambda kind, index: f'{kind}/synthetic-{index % 50}.jpg')
+    counts = {name: per_unit * scale for name, per_unit in SCALE.items()}
+
+    services = Service.objects.bulk_create([
+        Service(
+            name=f"Service {i}",
+            description=LOREM * 3,
+            price=rng.choice([None, 1500, 5000, 12000]),
+            icon='fas fa-code',
+            order=i,
+            is_featured=i < 6,
+        )
+        for i in range(counts['services'])
+    ], batch_size=BATCH_SIZE)
+
+    images = PortfolioImage.objects.bulk_create([
+        PortfolioImage(
+            title=f"Image {i}",
+            image=image_name('portfolio/images', i),
+            category=PortfolioImage.CATEGORY_CHOICES[i % len(PortfolioImage.CATEGORY_CHOICES)][0],
+            is_active=rng.random() > 0.1,
+            order=i,
+        )
+        for i in range(counts['images'])
+    ], batch_size=BATCH_SIZE)
+
+    start = date(2018, 1, 1)
+    projects = Project.objects.bulk_create([
+        Project(
+            title=f"Project {i}",
+            description=LOREM * 4,
+            image=image_name('projects', i),
+            client_name=f"Client {rng.randrange(200)}",
+            completion_date=start + timedelta(days=rng.randrange(2500)) if rng.random() > 0.05 else None,
+            is_featured=i < 12,
+            order=rng.randrange(100),
+        )
+        for i in range(counts['projects'])
+    ], batch_size=BATCH_SIZE)
+
+    # Fill the M2M through tables directly instead of one .set() per project
+    _insert_links(Project.services.through, 'project_id', 'service_id', [
+        (project.pk, service.pk)
+        for project in projects
+        for service in rng.sample(services, k=min(len(services), rng.randint(1, 3)))
+    ])
+    _insert_links(Project.additional_images.through, 'project_id', 'portfolioimage_id', [
+        (project.pk, image.pk)
+        for project in projects
+        for image in rng.sample(images, k=min(len(images), rng.randint(0, 3)))
+    ])
+
+    Technology.objects.bulk_create([
+        Technology(
+            name=f"Technology {i}",
+            icon='fas fa-code',
+            category=Technology.CATEGORY_CHOICES[i % len(Technology.CATEGORY_CHOICES)][0],
+            proficiency=rng.randint(50, 100),
+            order=i,
+        )
+        for i in range(counts['technologies'])
+    ], batch_size=BATCH_SIZE)
+
+    # Already delivered, so the outbox worker never mails them
+    ContactSubmission.objects.bulk_create([
+        ContactSubmission(
+            name=f"Visitor {i}",
+            email=f'visitor{i}@example.com',
+            subject=f"Enquiry {i}",
+            message=LOREM * 2,
+            read=rng.random() > 0.3,
+            delivery_status=ContactSubmission.DELIVERY_SENT,
+            delivery_attempts=1,
+        )
+        for i in range(counts['contact_submissions'])
+    ], batch_size=BATCH_SIZE)
+
+    Testimonial.objects.bulk_create([
+        Testimonial(
+            client_name=f"Client {i}",
+            company=f"Company {i}",
+            content=LOREM,
+            rating=rng.randint(3, 5),
+            is_featured=i < 8,
+            order=i,
+        )
+        for i in range(counts['testimonials'])
+    ], batch_size=BATCH_SIZE)
+
+    transaction.on_commit(partial(bump_version, 'service', 'project', 'portfolioimage', 'technology', 'testimonial'))
+    return counts
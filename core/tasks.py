@@ -0,0 +1,104 @@
+"""Local image-processing job queue.
+
+Jobs are rows in the ``ImageJob`` table, so no external broker is needed.
+Admin saves only insert a row; ``manage.py image_worker`` claims pending
+jobs and runs them in a process pool. Until a job finishes, templates keep
+serving the original image (see ``core.templatetags.responsive_images``).
+"""
+import logging
+import traceback
+
+import django
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import close_old_connections
+from django.utils import timezone
+from PIL import UnidentifiedImageError
+
+from .images import generate_derivatives, missing_derivatives
+from .models import ImageJob
+
+logger = logging.getLogger(__name__)
+
+
+def init_pool_process():
+    """``ProcessPoolExecutor`` initializer for the image commands"""
+    # Needed when the pool uses the "spawn" start method (macOS, Windows)
+    django.setup()
+
+
+def max_attempts():
+    return getattr(settings, 'IMAGE_JOB_MAX_ATTEMPTS', 3)
+
+
+def enqueue_derivatives(instance):
+    """Queue derivative generation for every image on ``instance`` that lacks it"""
+    queued = []
+    for fieldfile in missing_derivatives(instance):
+        active = ImageJob.objects.filter(
+            file_name=fieldfile.name,
+            status__in=[ImageJob.STATUS_PENDING, ImageJob.STATUS_RUNNING],
+        )
+        if not active.exists():
+            queued.append(ImageJob.objects.create(file_name=fieldfile.name))
+    return queued
+
+
+def reset_stale_jobs():
+    """Return jobs left running by a worker that died back to the queue"""
+    return ImageJob.objects.filter(status=ImageJob.STATUS_RUNNING).update(
+        status=ImageJob.STATUS_PENDING, updated_at=timezone.now(),
+    )
+
+
+def claim_jobs(limit):
+    """Mark up to ``limit`` pending jobs as running and return them"""
+    claimed = []
+    pending = ImageJob.objects.filter(status=ImageJob.STATUS_PENDING).values_list('pk', flat=True)[:limit]
+    for pk in list(pending):
+        updated = ImageJob.objects.filter(pk=pk, status=ImageJob.STATUS_PENDING).update(
+            status=ImageJob.STATUS_RUNNING, updated_at=timezone.now(),
+        )
+        if updated:
+            claimed.append(ImageJob.objects.get(pk=pk))
+    return claimed
+
+
+def run_job(file_name):
+    """Generate derivatives for ``file_name``; runs inside a pool process.
+
+    Returns ``None`` on success or a formatted error. Workers never touch
+    the database, so the pool needs no per-process connections.
+    """
+    try:
+        generate_derivatives(file_name, default_storage)
+    except (OSError, UnidentifiedImageError, ValueError):
+        return traceback.format_exc(limit=5)
+    return None
+
+
+def finish_job(job, error=None):
+    """Record the outcome of ``job``, re-queueing failures until they run out of attempts"""
+    job.attempts += 1
+    if error is None:
+        job.status = ImageJob.STATUS_DONE
+        job.error = ''
+    else:
+        job.error = error
+        job.status = ImageJob.STATUS_PENDING if job.attempts < max_attempts() else ImageJob.STATUS_FAILED
+        logger.warning("Image job %s for %s failed (attempt %s): %s", job.pk, job.file_name, job.attempts, error)
+    job.save(update_fields=['attempts', 'status', 'error', 'updated_at'])
+
+
+def process_pending_jobs(executor, batch_size):
+    """Run one batch of pending jobs on ``executor``; return how many ran"""
+    close_old_connections()
+    jobs = claim_jobs(batch_size)
+    futures = [(job, executor.submit(run_job, job.file_name)) for job in jobs]
+    for job, future in futures:
+        try:
+            error = future.result()
+        except Exception:  # the pool process itself died
+            error = traceback.format_exc(limit=5)
+        finish_job(job, error)
+    return len(jobs)
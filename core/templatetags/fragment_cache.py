@@ -0,0 +1,61 @@
+from django import template
+from django.conf import settings
+
+from core.cache import fragment_cache, fragment_cache_key
+from core.metrics import record_cache
+
+register = template.Library()
+
+
+class FragmentNode(template.Node):
+    def __init__(self, nodelist, name, models, vary_on):
+        self.nodelist = nodelist
+        self.name = name
+        self.models = models
+        self.vary_on = vary_on
+
+    def render(self, context):
+        if not getattr(settings, 'FRAGMENT_CACHE_ENABLED', True):
+            return self.nodelist.render(context)
+        key = fragment_cache_key(
+            self.name.resolve(context),
+            [model.resolve(context) for model in self.models],
+            [value.resolve(context) for value in self.vary_on],
+        )
+        cache = fragment_cache()
+        content = cache.get(key)
+        record_cache('fragment', content is not None)
+        if content is None:
+            content = self.nodelist.render(context)
+            cache.set(key, content, getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 3600))
+        return content
+
+
+@register.tag
+def fragment(parser, token):
+    """Cache the enclosed template until one of the named models changes.
+
+    Usage::
+
+        {% fragment "footer" "sitesetting" %}...{% endfragment %}
+        {% fragment "nav" "sitesetting" vary_on=request.resolver_match.url_name %}...{% endfragment %}
+
+    The first argument names the fragment, the rest are model names whose
+    content versions (see ``core.versions``) key the cached copy. Values
+    given as ``vary_on=`` (repeatable) get separate copies. The fragment
+    must not contain ``{% block %}`` tags or per-request data (CSRF tokens,
+    messages, the user) that is not part of ``vary_on``.
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' tag requires a fragment name")
+    models = []
+    vary_on = []
+    for bit in bits[2:]:
+        if bit.startswith('vary_on='):
+            vary_on.append(parser.compile_filter(bit[len('vary_on='):]))
+        else:
+            models.append(parser.compile_filter(bit))
+    nodelist = parser.parse(('endfragment',))
+    parser.delete_first_token()
+    return FragmentNode(nodelist, parser.compile_filter(bits[1]), models, vary_on)
@@ -0,0 +1,55 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from core.images import FORMATS, get_manifest, variant_names
+
+register = template.Library()
+
+DEFAULT_SIZES = '100vw'
+
+
+def _srcset(fieldfile, manifest, fmt):
+    storage = fieldfile.storage
+    names = variant_names(manifest, fieldfile.name, fmt)
+    return ', '.join(f'{storage.url(name)} {w}w' for name, w in zip(names, manifest['variants'][fmt]))
+
+
+@register.simple_tag
+def responsive_image(image, sizes=DEFAULT_SIZES, picture_class='', **attrs):
+    """Render ``image`` as a <picture> with AVIF/WebP/JPEG ``srcset``s.
+
+    Extra keyword arguments become <img> attributes (``alt``, ``class``...);
+    ``picture_class`` is set on the wrapping <picture>.
+    Falls back to a plain <img> of the original until derivatives exist.
+    """
+    if not image:
+        return ''
+    attrs.setdefault('alt', '')
+    attrs.setdefault('loading', 'lazy')
+    attrs.setdefault('decoding', 'async')
+    img_attrs = format_html_join(' ', '{}="{}"', attrs.items())
+
+    manifest = get_manifest(image)
+    if manifest is None:
+        return format_html('<img src="{}" {}>', image.url, img_attrs)
+
+    variants = manifest['variants']
+    sources = format_html_join(
+        '',
+        '<source type="{}" srcset="{}" sizes="{}">',
+        (
+            (FORMATS[fmt][0], _srcset(image, manifest, fmt), sizes)
+            for fmt in ('avif', 'webp') if variants.get(fmt)
+        ),
+    )
+    fallback = variants.get('jpeg')
+    if fallback:
+        return format_html(
+            '<picture class="{}">{}<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" {}></picture>',
+            picture_class, sources, image.storage.url(variant_names(manifest, image.name, 'jpeg')[-1]),
+            _srcset(image, manifest, 'jpeg'), sizes, manifest['width'], manifest['height'], img_attrs,
+        )
+    return format_html(
+        '<picture class="{}">{}<img src="{}" width="{}" height="{}" {}></picture>',
+        picture_class, sources, image.url, manifest['width'], manifest['height'], img_attrs,
+    )
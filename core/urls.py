@@ -6,8 +6,10 @@ urlpatterns = [
     path('services/', views.services, name='services'),
     path('services/<int:service_id>/', views.service_detail, name='service_detail'),
     path('projects/', views.projects, name='projects'),
+    path('projects/page/', views.projects_page, name='projects_page'),
     path('projects/<int:project_id>/', views.project_detail, name='project_detail'),
     path('contact/', views.contact, name='contact'),
     path('about/', views.about, name='about'),
     path('subscribe/', views.subscribe_newsletter, name='subscribe_newsletter'),
+    path('metrics', views.metrics, name='metrics'),
 ]
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""Content version counters used to key cached pages and fragments.
+
+Every save or delete of public content bumps the global ``content``
+version plus a per-model version (see ``core.signals``). Cache keys that
+embed a version become unreachable the moment the data behind them
+changes, so nothing has to be deleted explicitly. Versions live in the
+cache named by ``CONTENT_VERSION_CACHE_ALIAS``; point it at a shared
+backend when running several workers so a bump is seen by all of them.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+CONTENT = 'content'
+
+
+def _cache():
+    return caches[getattr(settings, 'CONTENT_VERSION_CACHE_ALIAS', 'default')]
+
+
+def _key(name):
+    return f'core:version:{name}'
+
+
+def get_version(name=CONTENT):
+    """Current version for ``name``, initialised on first use"""
+    cache = _cache()
+    version = cache.get(_key(name))
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(_key(name), version, None):
+            version = cache.get(_key(name), version)
+    return version
+
+
+def get_versions(*names):
+    """Current versions for several names, in the order given"""
+    cache = _cache()
+    found = cache.get_many([_key(name) for name in names])
+    return tuple(found.get(_key(name)) or get_version(name) for name in names)
+
+
+def bump_version(*names):
+    """Move ``names`` (and the global content version) to a new value"""
+    version = time.time_ns()
+    _cache().set_many({_key(name): version for name in {CONTENT, *names}}, None)
+    return version
@@ -1,42 +1,53 @@
-from django.shortcuts import render, redirect, get_object_or_404
-from django.core.mail import send_mail
+import asyncio
+import hmac
+
 from django.conf import settings
+from django.shortcuts import aget_object_or_404, render, redirect
+from django.template.loader import render_to_string
 from django.contrib import messages
-from django.http import JsonResponse
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, JsonResponse
 from django.views.decorators.http import require_POST
-from .models import Service, Project, PortfolioImage, Testimonial, SiteSetting, ContactSubmission, Technology
+from .cache import cache_public_page
+from .conditional import acondition, listing_last_modified, aproject_last_modified, aservice_last_modified, listing_etag
+from .metrics import metrics_enabled, registry, render as render_metrics
+from .models import Service, Project, Testimonial, ContactSubmission, NewsletterSubscriber, ImageJob
+from .outbox import due_submissions
+from .pagination import InvalidCursor, apaginate_projects
+from .ratelimit import rate_limit
+from .sections import SectionImages, aget_tech_stack
+from .site_settings import aget_site_settings, get_site_settings
 
-def get_site_settings():
-    """Get site settings or create default ones"""
-    try:
-        return SiteSetting.objects.first() or SiteSetting.objects.create(
-            site_name="DevPortfolio",
-            site_description="Professional Web Development Services"
-        )
-    except:
-        return SiteSetting.objects.create(
-            site_name="DevPortfolio",
-            site_description="Professional Web Development Services"
-        )
+async def _alist(queryset):
+    """Evaluate ``queryset`` with async iteration"""
+    return [obj async for obj in queryset]
 
-def home(request):
+@acondition(etag_func=listing_etag, last_modified_func=listing_last_modified)
+@cache_public_page
+async def home(request):
     """Homepage view with featured services and projects"""
-    site_settings = get_site_settings()
-    featured_services = Service.objects.filter(is_active=True, is_featured=True)[:6]
-    featured_projects = Project.objects.filter(is_featured=True)[:6]
+    # The sections are independent, so their queries are issued together
+    (site_settings, featured_services, featured_projects,
+     tech_stack, section_images, featured_testimonials) = await asyncio.gather(
+        aget_site_settings(),
+        _alist(Service.objects.filter(is_active=True, is_featured=True)[:6]),
+        _alist(Project.objects.filter(is_featured=True)[:6]),
+        aget_tech_stack(),
+        SectionImages().aload(),
+        _alist(Testimonial.objects.filter(is_featured=True)[:4]),
+    )
     
     # Technology stack for icons
-    tech_stack = Technology.objects.filter(is_active=True).order_by('category', 'order')[:12]
+    tech_stack = tech_stack.all[:12]
     
     # Get background images for sections
-    hero_bg = PortfolioImage.objects.filter(category='hero', is_active=True).first()
-    services_bg = PortfolioImage.objects.filter(category='services', is_active=True).first()
-    tech_bg = PortfolioImage.objects.filter(category='background', is_active=True).first()
-    projects_bg = PortfolioImage.objects.filter(category='projects', is_active=True).first()
-    testimonials_bg = PortfolioImage.objects.filter(category='testimonial', is_active=True).first()
-    cta_bg = PortfolioImage.objects.filter(category='cta', is_active=True).first()
-    
-    featured_testimonials = Testimonial.objects.filter(is_featured=True)[:4]
+    hero_bg = section_images.first('hero')
+    services_bg = section_images.first('services')
+    tech_bg = section_images.first('background')
+    projects_bg = section_images.first('projects')
+    testimonials_bg = section_images.first('testimonial')
+    cta_bg = section_images.first('cta')
     
     context = {
         'site_settings': site_settings,
@@ -53,18 +64,21 @@ def home(request):
     }
     return render(request, 'home.html', context)
 
-def services(request):
+@acondition(etag_func=listing_etag, last_modified_func=listing_last_modified)
+@cache_public_page
+async def services(request):
     """Services page view with all active services"""
-    site_settings = get_site_settings()
-    services = Service.objects.filter(is_active=True).order_by('order')
+    site_settings, services, section_images, tech_stack = await asyncio.gather(
+        aget_site_settings(),
+        _alist(Service.objects.filter(is_active=True).order_by('order')),
+        SectionImages().aload(),
+        aget_tech_stack(),
+    )
     
     # Get service-related images
-    service_bg_images = PortfolioImage.objects.filter(category='services', is_active=True).order_by('order')[:10]
-    service_icons = PortfolioImage.objects.filter(category='icon', is_active=True).order_by('order')[:12]
-    pattern_images = PortfolioImage.objects.filter(category='pattern', is_active=True).order_by('order')[:4]
-    
-    # Technology stack
-    tech_stack = Technology.objects.filter(is_active=True).order_by('category', 'order')
+    service_bg_images = section_images.top('services', 10)
+    service_icons = section_images.top('icon', 12)
+    pattern_images = section_images.top('pattern', 4)
     
     context = {
         'site_settings': site_settings,
@@ -72,15 +86,19 @@ def services(request):
         'service_bg_images': service_bg_images,
         'service_icons': service_icons,
         'pattern_images': pattern_images,
-        'tech_stack': tech_stack,
+        'tech_stack': tech_stack.all,
+        **tech_stack.context(),
     }
     return render(request, 'services.html', context)
 
-def service_detail(request, service_id):
+@acondition(etag_func=listing_etag, last_modified_func=aservice_last_modified)
+async def service_detail(request, service_id):
     """Service detail page"""
-    site_settings = get_site_settings()
-    service = get_object_or_404(Service, id=service_id, is_active=True)
-    related_projects = Project.objects.filter(services=service)[:4]
+    site_settings, service = await asyncio.gather(
+        aget_site_settings(),
+        aget_object_or_404(Service, id=service_id, is_active=True),
+    )
+    related_projects = await _alist(Project.objects.filter(services=service)[:4])
     
     context = {
         'site_settings': site_settings,
@@ -89,22 +107,40 @@ def service_detail(request, service_id):
     }
     return render(request, 'service_detail.html', context)
 
-def projects(request):
-    """Projects page view with all projects"""
-    site_settings = get_site_settings()
-    projects = Project.objects.all().order_by('order', '-completion_date')
+def _listing_projects(request):
+    """Projects for the listing, filtered in SQL by ``?service=<id>``"""
+    projects = Project.objects.prefetch_related('services', 'additional_images')
+    service_id = request.GET.get('service', '')
+    if service_id.isascii() and service_id.isdigit():
+        return projects.filter(services__id=int(service_id)), int(service_id)
+    return projects, None
+
+@acondition(etag_func=listing_etag, last_modified_func=listing_last_modified)
+@cache_public_page
+async def projects(request):
+    """Projects page view with the first page of projects"""
+    project_list, active_service = _listing_projects(request)
+    try:
+        projects = await apaginate_projects(project_list, request.GET.get('cursor'))
+    except InvalidCursor:
+        return HttpResponseBadRequest("Invalid cursor")
     
-    # Get project-related images
-    project_bg_images = PortfolioImage.objects.filter(category='projects', is_active=True).order_by('order')[:8]
-    gallery_images = PortfolioImage.objects.filter(category='general', is_active=True).order_by('order')[:12]
-    pattern_images = PortfolioImage.objects.filter(category='pattern', is_active=True).order_by('order')[:3]
+    site_settings, section_images, services = await asyncio.gather(
+        aget_site_settings(),
+        SectionImages().aload(),
+        # All services for filtering
+        _alist(Service.objects.filter(is_active=True)),
+    )
     
-    # Get all services for filtering
-    services = Service.objects.filter(is_active=True)
+    # Get project-related images
+    project_bg_images = section_images.top('projects', 8)
+    gallery_images = section_images.top('general', 12)
+    pattern_images = section_images.top('pattern', 3)
     
     context = {
         'site_settings': site_settings,
         'projects': projects,
+        'active_service': active_service,
         'project_bg_images': project_bg_images,
         'gallery_images': gallery_images,
         'pattern_images': pattern_images,
@@ -112,11 +148,38 @@ def projects(request):
     }
     return render(request, 'projects.html', context)
 
-def project_detail(request, project_id):
+@acondition(etag_func=listing_etag, last_modified_func=listing_last_modified)
+@cache_public_page
+async def projects_page(request):
+    """Next page of project cards for infinite scroll (JSON, or HTML with ?format=html)"""
+    project_list, active_service = _listing_projects(request)
+    try:
+        projects = await apaginate_projects(project_list, request.GET.get('cursor'))
+    except InvalidCursor:
+        return HttpResponseBadRequest("Invalid cursor")
+    
+    html = render_to_string('includes/project_cards.html', {'projects': projects}, request=request)
+    if request.GET.get('format') == 'html':
+        response = HttpResponse(html)
+        if projects.has_next:
+            response['X-Next-Cursor'] = projects.next_cursor
+        return response
+    return JsonResponse({
+        'html': html,
+        'next_cursor': projects.next_cursor,
+        'has_next': projects.has_next,
+    })
+
+@acondition(etag_func=listing_etag, last_modified_func=aproject_last_modified)
+async def project_detail(request, project_id):
     """Project detail page"""
-    site_settings = get_site_settings()
-    project = get_object_or_404(Project, id=project_id)
-    related_projects = Project.objects.filter(services__in=project.services.all()).exclude(id=project.id).distinct()[:3]
+    site_settings, project = await asyncio.gather(
+        aget_site_settings(),
+        aget_object_or_404(Project.objects.prefetch_related('services', 'additional_images'), id=project_id),
+    )
+    related_projects = await _alist(
+        Project.objects.filter(services__in=project.services.all()).exclude(id=project.id).distinct()[:3]
+    )
     
     context = {
         'site_settings': site_settings,
@@ -125,14 +188,16 @@ def project_detail(request, project_id):
     }
     return render(request, 'project_detail.html', context)
 
+@rate_limit('contact')
 def contact(request):
     """Contact page view"""
     site_settings = get_site_settings()
     
     # Get contact-related images
-    contact_images = PortfolioImage.objects.filter(category='contact', is_active=True).order_by('order')[:6]
-    pattern_images = PortfolioImage.objects.filter(category='pattern', is_active=True).order_by('order')[:2]
-    general_images = PortfolioImage.objects.filter(category='general', is_active=True).order_by('order')[:4]
+    section_images = SectionImages()
+    contact_images = section_images.top('contact', 6)
+    pattern_images = section_images.top('pattern', 2)
+    general_images = section_images.top('general', 4)
     
     if request.method == 'POST':
         # Process contact form
@@ -141,7 +206,8 @@ def contact(request):
         subject = request.POST.get('subject')
         message = request.POST.get('message')
         
-        # Save to database
+        # Save to database; the notification email is sent from the outbox
+        # by `manage.py send_contact_emails`
         ContactSubmission.objects.create(
             name=name,
             email=email,
@@ -149,19 +215,6 @@ def contact(request):
             message=message
         )
         
-        # Send email (configure email settings in production)
-        try:
-            send_mail(
-                f'Portfolio Contact: {subject}',
-                f'Name: {name}\nEmail: {email}\n\nMessage:\n{message}',
-                email,
-                [settings.DEFAULT_FROM_EMAIL],
-                fail_silently=False,
-            )
-        except Exception as e:
-            # Log error but don't show to user
-            print(f"Email sending failed: {e}")
-        
         messages.success(request, f"Thank you {name}! Your message has been sent. We'll get back to you soon.")
         return redirect('contact')
     
@@ -173,46 +226,73 @@ def contact(request):
     }
     return render(request, 'contact.html', context)
 
-def about(request):
+@acondition(etag_func=listing_etag, last_modified_func=listing_last_modified)
+@cache_public_page
+async def about(request):
     """About page view"""
-    site_settings = get_site_settings()
-    
-    # Get statistics
-    total_projects = Project.objects.count()
-    total_services = Service.objects.filter(is_active=True).count()
-    total_clients = Testimonial.objects.count()
-    
-    # Technology stack by category
-    frontend_tech = Technology.objects.filter(category='frontend', is_active=True)
-    backend_tech = Technology.objects.filter(category='backend', is_active=True)
-    database_tech = Technology.objects.filter(category='database', is_active=True)
-    mobile_tech = Technology.objects.filter(category='mobile', is_active=True)
-    cloud_tech = Technology.objects.filter(category='cloud', is_active=True)
+    # Statistics and the technology stack by category
+    site_settings, total_projects, total_services, total_clients, tech_stack = await asyncio.gather(
+        aget_site_settings(),
+        Project.objects.acount(),
+        Service.objects.filter(is_active=True).acount(),
+        Testimonial.objects.acount(),
+        aget_tech_stack(),
+    )
     
     context = {
         'site_settings': site_settings,
         'total_projects': total_projects,
         'total_services': total_services,
         'total_clients': total_clients,
-        'frontend_tech': frontend_tech,
-        'backend_tech': backend_tech,
-        'database_tech': database_tech,
-        'mobile_tech': mobile_tech,
-        'cloud_tech': cloud_tech,
+        **tech_stack.context(),
     }
     return render(request, 'about.html', context)
 
 @require_POST
+@rate_limit('newsletter', as_json=True)
 def subscribe_newsletter(request):
     """Handle newsletter subscription"""
-    email = request.POST.get('email')
+    email = NewsletterSubscriber.normalize_email(request.POST.get('email', ''))
     
-    if email:
-        # Here you would typically save to a newsletter model
-        # For now, we'll just return success
-        return JsonResponse({'success': True, 'message': 'Successfully subscribed to newsletter!'})
+    try:
+        validate_email(email)
+        if len(email) > NewsletterSubscriber._meta.get_field('email').max_length:
+            raise ValidationError("Email address too long")
+    except ValidationError:
+        return JsonResponse({'success': False, 'message': 'Please provide a valid email address.'})
     
-    return JsonResponse({'success': False, 'message': 'Please provide a valid email address.'})
+    NewsletterSubscriber.subscribe(email)
+    return JsonResponse({'success': True, 'message': 'Successfully subscribed to newsletter!'})
+
+def _metrics_authorized(request):
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token:
+        scheme, _, credentials = request.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() == 'bearer' and hmac.compare_digest(credentials.encode(), token.encode()):
+            return True
+    user = getattr(request, 'user', None)
+    return bool(user and user.is_active and user.is_staff)
+
+def metrics(request):
+    """Prometheus metrics for every worker, plus the background queue depths"""
+    if not metrics_enabled():
+        raise Http404
+    if not _metrics_authorized(request):
+        return HttpResponseForbidden()
+
+    gauges = [
+        ('portfolio_image_jobs_pending', 'Image derivative jobs waiting for a worker', {
+            (): ImageJob.objects.filter(status=ImageJob.STATUS_PENDING).count(),
+        }),
+        ('portfolio_contact_emails_pending', 'Contact notifications not yet delivered', {
+            (('state', 'due'),): due_submissions().count(),
+            (('state', 'pending'),): ContactSubmission.objects.filter(
+                delivery_status=ContactSubmission.DELIVERY_PENDING,
+            ).count(),
+        }),
+    ]
+    body = render_metrics(registry, registry.collect(), gauges)
+    return HttpResponse(body, content_type='text/plain; version=0.0.4; charset=utf-8')
 
 def handler404(request, exception):
     """Custom 404 handler"""